@@ -6,10 +6,11 @@ A comprehensive profiling tool for the Dynamic Prefetched Cache system.
 Provides detailed performance analysis with multiple profiling approaches.
 
 Usage:
-    python examples/profile_example.py [pattern] [--detailed]
+    python examples/profile_example.py [pattern] [--detailed] [--sampling]
     
     pattern: sequential, random, jumps, mixed (default: all)
     --detailed: Enable detailed function-level profiling
+    --sampling: Use the low-overhead pyinstrument sampling profiler (pip install pyinstrument)
 """
 
 import sys
@@ -19,8 +20,10 @@ import pstats
 import io
 import argparse
 import tracemalloc
+from array import array
+from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Generator, Optional, Tuple
+from typing import DefaultDict, List, Generator, Optional, Tuple
 from contextlib import contextmanager
 
 # Add parent directory to Python path
@@ -36,14 +39,23 @@ class ApplicationProfiler:
     
     def __init__(self, data_file: str = 'examples/data/ultra_dense_data.txt'):
         self.data_file = data_file
-        self.results: Dict[str, List[float]] = {}
-        
-    def setup_system(self) -> tuple:
-        """Set up the complete cache system."""
-        provider = MOTDataProvider(self.data_file)
+        self.results: DefaultDict[str, 'array[float]'] = defaultdict(lambda: array('d'))
+        
+    def setup_system(self, provider: Optional[MOTDataProvider] = None) -> tuple:
+        """
+        Set up the complete cache system and the sorted list of available frames.
+        
+        An existing provider is reused with its frame caches cleared, so only
+        its index is shared and every run starts from a cold cache.
+        """
+        if provider is None:
+            provider = MOTDataProvider(self.data_file)
+        else:
+            provider.clear_cache()
         predictor = DynamicDataPredictor(possible_jumps=NAVIGATION_STEPS)
         cache = DynamicPrefetchingCache(provider, predictor)
-        return provider, predictor, cache
+        available_frames = sorted(provider.get_available_frames())
+        return provider, predictor, cache, available_frames
     
     @contextmanager
     def timer(self, operation_name: str) -> Generator[None, None, None]:
@@ -52,41 +64,49 @@ class ApplicationProfiler:
         try:
             yield
         finally:
-            duration = time.perf_counter() - start_time
-            if operation_name not in self.results:
-                self.results[operation_name] = []
-            self.results[operation_name].append(duration)
+            self.results[operation_name].append(time.perf_counter() - start_time)
     
-    def profile_access_pattern(self, pattern_name: str, num_operations: int = 1000) -> Optional[float]:
-        """Profile a specific access pattern."""
-        provider, predictor, cache = self.setup_system()
-        available_frames = sorted(provider.get_available_frames())
+    @staticmethod
+    def build_access_sequence(pattern_name: str, available_frames: List[int], num_operations: int) -> Optional[List[int]]:
+        """Precompute the frames a pattern visits, so the timed loop only calls cache.get()."""
+        n = len(available_frames)
+        steps = range(min(num_operations, n * 2))
+        if pattern_name == 'sequential':
+            return [available_frames[i % n] for i in steps]
+        if pattern_name == 'random':
+            return [available_frames[(i * 17) % n] for i in steps]
+        if pattern_name == 'jumps':
+            return [available_frames[(i * 15) % n] if i % 5 == 0 else available_frames[(i - 1) % n] + 1 for i in steps]
+        if pattern_name == 'mixed':
+            return [available_frames[(i * 7) % n] if i % 3 == 0 else available_frames[i % n] for i in steps]
+        return None
+    
+    def profile_access_pattern(self, pattern_name: str, num_operations: int = 1000,
+                               provider: Optional[MOTDataProvider] = None) -> Optional[float]:
+        """
+        Profile a specific access pattern on a cold cache.
+        
+        If `provider` is given its index is reused (see setup_system); otherwise
+        a new provider is built for this run.
+        """
+        provider, predictor, cache, available_frames = self.setup_system(provider)
         
         if not available_frames:
             print("❌ No frames available for profiling")
+            cache.close()
             return None
         
-        # Define access patterns
-        patterns = {
-            'sequential': lambda i: available_frames[i % len(available_frames)],
-            'random': lambda i: available_frames[(i * 17) % len(available_frames)],
-            'jumps': lambda i: available_frames[(i * 15) % len(available_frames)] if i % 5 == 0 else available_frames[(i-1) % len(available_frames)] + 1,
-            'mixed': lambda i: available_frames[(i * 7) % len(available_frames)] if i % 3 == 0 else available_frames[i % len(available_frames)]
-        }
-        
-        if pattern_name not in patterns:
+        frames = self.build_access_sequence(pattern_name, available_frames, num_operations)
+        if frames is None:
             print(f"❌ Unknown pattern: {pattern_name}")
+            cache.close()
             return None
         
-        pattern_func = patterns[pattern_name]
-        
         print(f"🔍 Profiling {pattern_name} access pattern...")
         
         with self.timer(f'{pattern_name}_access'):
-            for i in range(min(num_operations, len(available_frames) * 2)):
-                frame = pattern_func(i)
-                if frame < len(available_frames):
-                    cache.get(frame)
+            for frame in frames:
+                cache.get(frame)
         
         # Report results
         stats = cache.stats()
@@ -98,17 +118,16 @@ class ApplicationProfiler:
         cache.close()
         return hit_rate
     
-    def profile_system_components(self) -> None:
-        """Profile individual system components."""
+    def profile_system_components(self, provider: Optional[MOTDataProvider] = None) -> None:
+        """Profile individual system components, starting from cold caches."""
         print("🔍 Profiling System Components...")
         
-        provider, predictor, cache = self.setup_system()
-        available_frames = sorted(provider.get_available_frames())[:100]  # Limit for faster profiling
+        provider, predictor, cache, available_frames = self.setup_system(provider)
+        available_frames = available_frames[:100]  # Limit for faster profiling
         
-        # Profile data provider
+        # Profile data provider (one batched call instead of a load per frame)
         with self.timer('provider_load'):
-            for frame in available_frames[:50]:
-                provider.load(frame)
+            provider.load_batch(available_frames[:50])
         
         # Profile predictor
         history = available_frames[:10]
@@ -146,44 +165,88 @@ class ApplicationProfiler:
         
         return profile_output
     
-    def profile_memory_usage(self, num_operations: int = 500) -> Tuple[int, int]:
-        """Profile memory usage."""
+    def profile_with_sampling(self, pattern: str = 'mixed', num_operations: int = 200) -> Optional[str]:
+        """Profile using the pyinstrument sampling profiler, which adds far less overhead than cProfile."""
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("❌ Sampling profiling requires pyinstrument (pip install pyinstrument)")
+            return None
+        
+        print("🔍 Running Sampling Profile...")
+        
+        profiler = Profiler()
+        with profiler:
+            self.profile_access_pattern(pattern, num_operations)
+        
+        profile_output = profiler.output_text(unicode=True, color=True)
+        print(profile_output)
+        
+        return profile_output
+    
+    def profile_memory_usage(self, num_operations: int = 500,
+                             provider: Optional[MOTDataProvider] = None) -> Tuple[int, int]:
+        """
+        Profile memory usage.
+        
+        Tracing starts before the run, so a reused `provider`'s index, built
+        earlier, is not included in the numbers.
+        """
         print("🔍 Profiling Memory Usage...")
         
-        tracemalloc.start()
+        # Single-frame tracebacks keep the tracing overhead on the workload low
+        tracemalloc.start(1)
         
-        # Run test workload
-        self.profile_access_pattern('mixed', num_operations)
+        try:
+            # Run test workload
+            self.profile_access_pattern('mixed', num_operations, provider=provider)
+            
+            # Get memory statistics
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                (tracemalloc.Filter(True, "*dynamic_prefetching_cache*"),)
+            )
+        finally:
+            tracemalloc.stop()
         
-        # Get memory statistics
-        current, peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
+        package_bytes = sum(stat.size for stat in snapshot.statistics('filename'))
         
         print(f"  📊 Memory Usage: {current / 1024 / 1024:.1f} MB current, {peak / 1024 / 1024:.1f} MB peak")
+        print(f"  📦 Held by dynamic_prefetching_cache: {package_bytes / 1024 / 1024:.1f} MB")
+        if provider is not None:
+            print("  ℹ️  Excludes the reused provider's frame index, built before tracing")
         
         return current, peak
     
-    def run_comprehensive_profile(self, detailed: bool = False) -> None:
+    def run_comprehensive_profile(self, detailed: bool = False, sampling: bool = False) -> None:
         """Run a comprehensive performance profile."""
         print("🚀 Starting Comprehensive Application Profile")
         print("=" * 50)
         
-        # Test all access patterns
-        patterns = ['sequential', 'random', 'jumps', 'mixed']
-        hit_rates = {}
-        
-        for pattern in patterns:
-            hit_rates[pattern] = self.profile_access_pattern(pattern, 500)
-        
-        # Profile system components
-        self.profile_system_components()
+        # Index the data file once; every run still gets its own cold cache
+        provider = MOTDataProvider(self.data_file)
         
-        # Memory profiling
-        self.profile_memory_usage(300)
+        try:
+            # Test all access patterns
+            patterns = ['sequential', 'random', 'jumps', 'mixed']
+            hit_rates = {}
+            
+            for pattern in patterns:
+                hit_rates[pattern] = self.profile_access_pattern(pattern, 500, provider=provider)
+            
+            # Profile system components
+            self.profile_system_components(provider=provider)
+            
+            # Memory profiling
+            self.profile_memory_usage(300, provider=provider)
+        finally:
+            provider.close()
         
         # Detailed profiling if requested
         if detailed:
             self.profile_with_cprofile('mixed', 200)
+        if sampling:
+            self.profile_with_sampling('mixed', 200)
         
         # Print summary
         print("\n" + "=" * 50)
@@ -191,7 +254,7 @@ class ApplicationProfiler:
         print("=" * 50)
         
         # Access pattern results
-        print("Cache Hit Rates:")
+        print("Cache Hit Rates (cold cache per pattern):")
         for pattern, hit_rate in hit_rates.items():
             if hit_rate is not None:
                 print(f"  {pattern.capitalize():12}: {hit_rate:.1%}")
@@ -213,17 +276,21 @@ def main() -> None:
                        help='Access pattern to profile (default: all)')
     parser.add_argument('--detailed', action='store_true',
                        help='Enable detailed function-level profiling')
+    parser.add_argument('--sampling', action='store_true',
+                       help='Enable sampling profiling with pyinstrument')
     
     args = parser.parse_args()
     
     profiler = ApplicationProfiler()
     
     if args.pattern == 'all':
-        profiler.run_comprehensive_profile(detailed=args.detailed)
+        profiler.run_comprehensive_profile(detailed=args.detailed, sampling=args.sampling)
     else:
         profiler.profile_access_pattern(args.pattern, 1000)
         if args.detailed:
             profiler.profile_with_cprofile(args.pattern, 200)
+        if args.sampling:
+            profiler.profile_with_sampling(args.pattern, 200)
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
@@ -18,8 +18,12 @@ sys.path.insert(0, str(parent_dir))
 import tkinter as tk
 from tkinter import ttk
 import time
+import threading
+import bisect
+import heapq
+import operator
 import logging
-from typing import Optional, Set, List, Dict, Any, Callable
+from typing import Optional, Set, List, Dict, Any, Callable, Tuple
 
 # Set up debug logging
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -32,6 +36,19 @@ cache_logger.setLevel(logging.DEBUG)
 from src.dynamic_prefetching_cache import DynamicPrefetchingCache, DynamicDataPredictor, MOTDataProvider, EvictionPolicyOldest
 
 NAVIGATION_STEPS = [-15, -5, -1, 1, 5, 15]
+MAX_PREDICTIONS_SHOWN = 20
+MAX_EVENTS_SHOWN = 20
+LEGEND_Y = 5
+FAST_TICK_MS = 100  # Stats and prefetch panels
+SLOW_TICK_MS = 250  # Timeline canvas, and idle back-off for the fast clock
+
+# Timeline box states and their (fill, outline) colors
+FRAME_NOT_CACHED, FRAME_CACHED, FRAME_CURRENT = 0, 1, 2
+FRAME_STATE_COLORS = {
+    FRAME_NOT_CACHED: ('lightgray', 'gray'),
+    FRAME_CACHED: ('lightgreen', 'green'),
+    FRAME_CURRENT: ('red', 'darkred'),
+}
 
 class CacheVisualizerApp:
     """Main application window with cache visualization."""
@@ -51,12 +68,33 @@ class CacheVisualizerApp:
         )
         
         # State
-        available_frames = sorted(self.provider.get_available_frames())
-        self.current_frame: Optional[int] = available_frames[0] if available_frames else None
+        # The provider's frame set is fixed after indexing, so sort it once here
+        # rather than on every navigation/redraw.
+        self._available_frames: List[int] = sorted(self.provider.get_available_frames())
+        self._available_frames_set: Set[int] = set(self._available_frames)
+        self._frame_to_index: Dict[int, int] = {f: i for i, f in enumerate(self._available_frames)}
+        self.current_frame: Optional[int] = self._available_frames[0] if self._available_frames else None
         self.cached_frames: Set[int] = set()
-        self.recent_events: List[str] = []
+        # on_cache_event runs on the prefetch worker thread; this guards copies of
+        # cached_frames against its updates (membership tests and len() are atomic)
+        self._cached_frames_lock = threading.Lock()
+        self._last_stats_text = ""
+        self._last_prefetch_text = ""
+        self._last_predict_key: Optional[Tuple[int, Tuple[int, ...]]] = None
+        self._last_sorted_scores: List[Tuple[int, float]] = []
+        self._timestamp_second = -1
+        self._timestamp_text = ""
         self.stats: Dict[str, Any] = {}
         
+        # Panels only redraw when something they show has changed
+        self._dirty: Dict[str, bool] = {'timeline': True, 'stats': True, 'prefetch': True}
+        
+        # Timeline canvas items, kept between redraws so unchanged windows are only recolored
+        self._timeline_items: List[int] = []
+        self._timeline_state: List[int] = []
+        self._timeline_layout: Optional[Tuple[int, int, int, int, int]] = None
+        self._prev_cached_frames: Set[int] = set()
+        
         self.setup_ui()
         self.update_display()
     
@@ -78,6 +116,16 @@ class CacheVisualizerApp:
         # Canvas for timeline
         self.canvas = tk.Canvas(timeline_frame, height=100, bg='white')
         self.canvas.grid(row=0, column=0, sticky=tk.W + tk.E)
+        self.canvas.bind('<Configure>', lambda _event: self._mark_dirty('timeline'))
+        
+        # Legend (always visible at top-left) and window info, updated in place by draw_timeline
+        self._legend_ids = [
+            self.canvas.create_text(10, LEGEND_Y, text="Current", fill='red', anchor='w', font=('Arial', 8, 'bold'), tags='legend'),
+            self.canvas.create_text(60, LEGEND_Y, text="Cached", fill='green', anchor='w', font=('Arial', 8), tags='legend'),
+            self.canvas.create_text(110, LEGEND_Y, text="Not Cached", fill='gray', anchor='w', font=('Arial', 8), tags='legend'),
+        ]
+        self._window_info_id = self.canvas.create_text(800, LEGEND_Y, text="", fill='blue', anchor='e',
+                                                       font=('Arial', 8), tags='legend')
         
         # Scrollbar for timeline
         scrollbar = ttk.Scrollbar(timeline_frame, orient=tk.HORIZONTAL, command=self.canvas.xview)
@@ -181,31 +229,29 @@ class CacheVisualizerApp:
     def navigate(self, delta: int) -> None:
         """Navigate by delta frames - SIMPLE cache usage."""
         try:
-            available_frames = sorted(self.provider.get_available_frames())
+            available_frames = self._available_frames
             if not available_frames:
                 return
                 
             # Find current position in available frames
-            try:
-                if self.current_frame is not None:
-                    current_idx = available_frames.index(self.current_frame)
-                else:
-                    current_idx = 0
-            except ValueError:
-                current_idx = 0
+            current_idx = self._frame_to_index.get(self.current_frame, 0) if self.current_frame is not None else 0
             
             # Calculate new index
             new_idx = max(0, min(current_idx + delta, len(available_frames) - 1))
             new_frame = available_frames[new_idx]
             
             if new_frame != self.current_frame:
-                logger.debug(f"NAVIGATE: {self.current_frame} -> {new_frame} (delta: {delta})")
+                debug = logger.isEnabledFor(logging.DEBUG)
+                if debug:
+                    logger.debug(f"NAVIGATE: {self.current_frame} -> {new_frame} (delta: {delta})")
                 self.current_frame = new_frame
+                self._mark_dirty('timeline', 'stats', 'prefetch')
                 # LINE 1: Just get the data - cache handles everything internally
-                start_time = time.time()
+                t0 = time.perf_counter_ns()
                 frame_data = self.cache.get(self.current_frame)
-                end_time = time.time()
-                logger.debug(f"NAVIGATE: {self.current_frame} -> {new_frame} (time: {end_time - start_time:.6f}s)")
+                dt_ns = time.perf_counter_ns() - t0
+                if debug:
+                    logger.debug(f"NAVIGATE: {self.current_frame} -> {new_frame} (time: {dt_ns / 1e9:.6f}s)")
                 self.add_event(f"Loaded frame {self.current_frame}")
                     
         except Exception as e:
@@ -215,16 +261,19 @@ class CacheVisualizerApp:
         """Jump to specific frame number."""
         try:
             frame_num = int(self.jump_entry.get())
-            available_frames = self.provider.get_available_frames()
             
-            if frame_num in available_frames:
-                logger.debug(f"JUMP: {self.current_frame} -> {frame_num}")
+            if frame_num in self._available_frames_set:
+                debug = logger.isEnabledFor(logging.DEBUG)
+                if debug:
+                    logger.debug(f"JUMP: {self.current_frame} -> {frame_num}")
                 self.current_frame = frame_num
+                self._mark_dirty('timeline', 'stats', 'prefetch')
                 # LINE 2: Just get the data - cache handles everything internally
-                start_time = time.time()
+                t0 = time.perf_counter_ns()
                 frame_data = self.cache.get(self.current_frame)
-                end_time = time.time()
-                logger.debug(f"JUMP: {self.current_frame} -> {frame_num} (time: {end_time - start_time:.6f}s)")
+                dt_ns = time.perf_counter_ns() - t0
+                if debug:
+                    logger.debug(f"JUMP: {self.current_frame} -> {frame_num} (time: {dt_ns / 1e9:.6f}s)")
                 self.add_event(f"Jumped to frame {self.current_frame}")
             else:
                 self.add_event(f"Frame {frame_num} not available")
@@ -237,80 +286,143 @@ class CacheVisualizerApp:
         """Handle cache events."""
         # LINE 3: Track what's cached for UI display
         if event_name in ['cache_load_complete', 'prefetch_success']:
-            self.cached_frames.add(kwargs['key'])
+            with self._cached_frames_lock:
+                self.cached_frames.add(kwargs['key'])
         elif event_name == 'cache_evict':
-            self.cached_frames.discard(kwargs['key'])
+            with self._cached_frames_lock:
+                self.cached_frames.discard(kwargs['key'])
+        else:
+            return
+        # Bursts of events between two ticks collapse into a single redraw
+        self._mark_dirty('timeline', 'stats', 'prefetch')
+    
+    def _mark_dirty(self, *panels: str) -> None:
+        """Flag panels for redraw on the next display tick."""
+        for panel in panels:
+            self._dirty[panel] = True
+    
+    def _timestamp(self) -> str:
+        """Wall-clock HH:MM:SS string, formatted at most once per second."""
+        now = int(time.time())
+        if now != self._timestamp_second:
+            self._timestamp_second = now
+            self._timestamp_text = time.strftime('%H:%M:%S', time.localtime(now))
+        return self._timestamp_text
     
     def add_event(self, event_str: str) -> None:
-        """Add event to recent events list with thread safety."""
+        """Append an event to the events log, keeping only the most recent lines."""
         try:
-            self.recent_events.append(f"{time.strftime('%H:%M:%S')} - {event_str}")
-            if len(self.recent_events) > 20:
-                self.recent_events.pop(0)
+            # Only auto-scroll to bottom if user was already at bottom
+            is_at_bottom = self.events_text.yview()[1] >= 0.98
+            
+            prefix = "\n" if self.events_text.compare('end-1c', '!=', '1.0') else ""
+            self.events_text.insert(tk.END, f"{prefix}{self._timestamp()} - {event_str}")
+            
+            line_count = int(self.events_text.index('end-1c').split('.')[0])
+            if line_count > MAX_EVENTS_SHOWN:
+                self.events_text.delete('1.0', f'{line_count - MAX_EVENTS_SHOWN + 1}.0')
+            
+            if is_at_bottom:
+                self.events_text.see(tk.END)
         except Exception as e:
             print(f"Error adding event: {e}")
     
     def update_display(self) -> None:
-        """Update the visual display with error protection."""
+        """Start the display refresh clocks."""
+        self._tick_fast()
+        self._tick_slow()
+    
+    def _tick_fast(self) -> None:
+        """Refresh the cheap text panels, backing off while nothing changes."""
+        redrawn = self._redraw_dirty((('stats', self.update_stats),
+                                      ('prefetch', self.update_prefetch)))
+        self._schedule(FAST_TICK_MS if redrawn else SLOW_TICK_MS, self._tick_fast)
+    
+    def _tick_slow(self) -> None:
+        """Refresh the timeline canvas, the most expensive panel, at a lower rate."""
+        self._redraw_dirty((('timeline', self.draw_timeline),))
+        self._schedule(SLOW_TICK_MS, self._tick_slow)
+    
+    def _redraw_dirty(self, panels: Tuple[Tuple[str, Callable[[], None]], ...]) -> bool:
+        """Run the updaters of dirty panels with error protection; return whether any ran."""
+        redrawn = False
         try:
-            self.draw_timeline()
-            self.update_stats()
-            self.update_prefetch()
-            self.update_events()
+            for panel, updater in panels:
+                if self._dirty[panel]:
+                    self._dirty[panel] = False
+                    updater()
+                    redrawn = True
         except Exception as e:
             print(f"Error updating display: {e}")
-        finally:
-            # Schedule next update
-            try:
-                self.root.after(100, self.update_display)
-            except tk.TclError:
-                # UI is closing, stop updates
-                pass
+        return redrawn
+    
+    def _schedule(self, delay_ms: int, tick: Callable[[], None]) -> None:
+        """Schedule the next tick of a refresh clock."""
+        try:
+            self.root.after(delay_ms, tick)
+        except tk.TclError:
+            # UI is closing, stop updates
+            pass
     
     def draw_timeline(self) -> None:
         """Draw the frame timeline showing only frames around current position."""
         try:
-            self.canvas.delete("all")
-            
             # Timeline parameters
             canvas_width = self.canvas.winfo_width() or 800
             canvas_height = self.canvas.winfo_height() or 100
             
             if canvas_width <= 1:  # Canvas not initialized yet
+                self._mark_dirty('timeline')
                 return
             
             # Get all available frames
-            all_frames = sorted(self.provider.get_available_frames())
+            all_frames = self._available_frames
             if not all_frames or self.current_frame is None:
                 # Show a message if no frames available
+                self._clear_timeline()
                 self.canvas.create_text(canvas_width//2, canvas_height//2, 
                                       text="No frames available" if not all_frames else "No current frame",
-                                      fill='red', font=('Arial', 12))
+                                      fill='red', font=('Arial', 12), tags='timeline')
                 return
             
             # OPTIMIZATION: Only show frames in a reasonable window around current frame
             window_size = 200  # Show ±200 frames around current (total 400 frames max)
             
-            # Find frames to display - more robust filtering
-            frames_to_show = []
             current_frame = self.current_frame
             
             # Find the range of frames to show
             min_frame = current_frame - window_size
             max_frame = current_frame + window_size
             
-            # Filter frames within the window
-            for frame in all_frames:
-                if min_frame <= frame <= max_frame:
-                    frames_to_show.append(frame)
+            # all_frames is sorted, so the window is a contiguous slice
+            window_start = bisect.bisect_left(all_frames, min_frame)
+            window_end = bisect.bisect_right(all_frames, max_frame)
+            frames_to_show = all_frames[window_start:window_end]
             
             if not frames_to_show:
                 # Show debug info if no frames in window
+                self._clear_timeline()
                 self.canvas.create_text(canvas_width//2, canvas_height//2, 
                                       text=f"No frames in window ±{window_size} around {current_frame}",
-                                      fill='orange', font=('Arial', 10))
+                                      fill='orange', font=('Arial', 10), tags='timeline')
+                return
+            
+            with self._cached_frames_lock:
+                cached_frames = set(self.cached_frames)
+            layout = (window_start, window_end, current_frame, canvas_width, canvas_height)
+            if layout == self._timeline_layout:
+                # Same window as last draw: only recolor boxes whose cache state flipped
+                for frame_num in cached_frames ^ self._prev_cached_frames:
+                    i = self._frame_to_index.get(frame_num, -1) - window_start
+                    if 0 <= i < len(frames_to_show):
+                        self._set_timeline_state(i, self._frame_state(frame_num, cached_frames))
+                self._prev_cached_frames = cached_frames
                 return
             
+            self._clear_timeline()
+            self._timeline_layout = layout
+            self._prev_cached_frames = cached_frames
+            
             # Calculate frame width and total timeline width
             frame_width = max(5, min(20, canvas_width // len(frames_to_show)))  # Adaptive width
             total_width = len(frames_to_show) * frame_width
@@ -319,36 +431,29 @@ class CacheVisualizerApp:
             for i, frame_num in enumerate(frames_to_show):
                 x = i * frame_width
                 
-                # Determine color based on state
-                if frame_num == self.current_frame:
-                    color = 'red'  # Current frame
-                    outline = 'darkred'
-                elif frame_num in self.cached_frames:
-                    color = 'lightgreen'  # Cached frame
-                    outline = 'green'
-                else:
-                    color = 'lightgray'  # Not cached
-                    outline = 'gray'
+                state = self._frame_state(frame_num, cached_frames)
+                color, outline = FRAME_STATE_COLORS[state]
                 
                 # Draw frame rectangle
-                self.canvas.create_rectangle(
+                self._timeline_items.append(self.canvas.create_rectangle(
                     x, 10, x + frame_width - 2, canvas_height - 10,
-                    fill=color, outline=outline, width=1
-                )
+                    fill=color, outline=outline, width=1, tags='timeline'
+                ))
+                self._timeline_state.append(state)
                 
                 # Draw frame number (every 10th frame or for current frame)
                 if frame_num % 10 == 0 or frame_num == self.current_frame:
                     self.canvas.create_text(
                         x + frame_width/2, canvas_height - 20,
-                        text=str(frame_num), font=('Arial', 8)
+                        text=str(frame_num), font=('Arial', 8), tags='timeline'
                     )
             
             # Set scroll region to only the visible window
             self.canvas.configure(scrollregion=(0, 0, total_width, canvas_height))
             
             # Center the current frame in the view
-            if self.current_frame in frames_to_show:
-                current_idx = frames_to_show.index(self.current_frame)
+            if self.current_frame in self._frame_to_index:
+                current_idx = self._frame_to_index[self.current_frame] - window_start
                 current_x = current_idx * frame_width
                 # Center the current frame
                 center_x = current_x + frame_width / 2
@@ -357,20 +462,38 @@ class CacheVisualizerApp:
                     scroll_pos = max(0, min(1, (center_x - view_center) / (total_width - canvas_width)))
                     self.canvas.xview_moveto(scroll_pos)
             
-            # Legend (always visible at top-left)
-            legend_y = 5
-            self.canvas.create_text(10, legend_y, text="Current", fill='red', anchor='w', font=('Arial', 8, 'bold'))
-            self.canvas.create_text(60, legend_y, text="Cached", fill='green', anchor='w', font=('Arial', 8))
-            self.canvas.create_text(110, legend_y, text="Not Cached", fill='gray', anchor='w', font=('Arial', 8))
-            
-            # Show window info
-            self.canvas.create_text(canvas_width - 10, legend_y, 
-                                  text=f"Showing ±{window_size} frames ({len(frames_to_show)} total)", 
-                                  fill='blue', anchor='e', font=('Arial', 8))
+            # Legend items are created once in setup_ui; only the window info changes
+            self.canvas.coords(self._window_info_id, canvas_width - 10, LEGEND_Y)
+            self.canvas.itemconfigure(self._window_info_id,
+                                      text=f"Showing ±{window_size} frames ({len(frames_to_show)} total)")
+            self.canvas.tag_raise('legend')
             
         except Exception as e:
             print(f"Error drawing timeline: {e}")
     
+    def _frame_state(self, frame_num: int, cached_frames: Set[int]) -> int:
+        """Classify a timeline box as current, cached or not cached."""
+        if frame_num == self.current_frame:
+            return FRAME_CURRENT
+        if frame_num in cached_frames:
+            return FRAME_CACHED
+        return FRAME_NOT_CACHED
+    
+    def _set_timeline_state(self, index: int, state: int) -> None:
+        """Recolor a single timeline box if its state changed."""
+        if self._timeline_state[index] != state:
+            color, outline = FRAME_STATE_COLORS[state]
+            self.canvas.itemconfigure(self._timeline_items[index], fill=color, outline=outline)
+            self._timeline_state[index] = state
+    
+    def _clear_timeline(self) -> None:
+        """Remove all timeline items and forget the drawn layout."""
+        self.canvas.delete('timeline')
+        self.canvas.itemconfigure(self._window_info_id, text="")
+        self._timeline_items.clear()
+        self._timeline_state.clear()
+        self._timeline_layout = None
+    
     def update_stats(self) -> None:
         """Update statistics display."""
         # LINE 4: Get cache stats for display
@@ -397,6 +520,10 @@ Prefetch:
         
         stats_text += f"\n\nHit Rate: {hit_rate:.1f}%"
         
+        if stats_text == self._last_stats_text:
+            return
+        self._last_stats_text = stats_text
+        
         # Preserve scroll position
         scroll_position = self.stats_text.yview()
         self.stats_text.delete(1.0, tk.END)
@@ -407,13 +534,23 @@ Prefetch:
         """Update prefetch queue display."""
         # LINE 5: Get predictions for display
         if self.current_frame is not None:
-            scores = self.predictor.get_likelihoods(self.current_frame, list(self.cache.history))
+            # The cache returns its history as a fresh array, so it can be handed over as is
+            history = self.cache.history
             
-            # Sort by likelihood (highest first)
-            sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+            # Predictions only depend on position and history, so reuse the last
+            # result until either changes; cached-frame marks are applied below
+            history_snapshot = tuple(history)
+            predict_key = (self.current_frame, history_snapshot)
+            if predict_key != self._last_predict_key:
+                scores = self.predictor.get_likelihoods(self.current_frame, history)
+                
+                # Top predictions by likelihood (highest first)
+                self._last_sorted_scores = heapq.nlargest(MAX_PREDICTIONS_SHOWN, scores.items(), key=operator.itemgetter(1))
+                self._last_predict_key = predict_key
+            sorted_scores = self._last_sorted_scores
             
             prefetch_text = f"Current Frame: {self.current_frame}\n"
-            prefetch_text += f"History: {list(self.cache.history)[-5:]}\n\n"
+            prefetch_text += f"History: {list(history_snapshot[-5:])}\n\n"
             prefetch_text += "Predictions:\n"
             
             for i, (frame, likelihood) in enumerate(sorted_scores):
@@ -430,34 +567,16 @@ Prefetch:
         else:
             prefetch_text = "No current frame"
         
+        if prefetch_text == self._last_prefetch_text:
+            return
+        self._last_prefetch_text = prefetch_text
+        
         # Preserve scroll position
         scroll_position = self.prefetch_text.yview()
         self.prefetch_text.delete(1.0, tk.END)
         self.prefetch_text.insert(1.0, prefetch_text)
         self.prefetch_text.yview_moveto(scroll_position[0])
     
-    def update_events(self) -> None:
-        """Update events display."""
-        try:
-            events_text = "\n".join(self.recent_events[-20:])  # Show last 20 events
-            
-            # Check if user has scrolled up manually
-            scroll_position = self.events_text.yview()
-            is_at_bottom = scroll_position[1] >= 0.98  # Close to bottom
-            
-            self.events_text.delete(1.0, tk.END)
-            self.events_text.insert(1.0, events_text)
-            
-            # Only auto-scroll to bottom if user was already at bottom
-            if is_at_bottom:
-                self.events_text.see(tk.END)
-            else:
-                # Preserve scroll position if user scrolled up
-                self.events_text.yview_moveto(scroll_position[0])
-                
-        except Exception as e:
-            print(f"Error updating events: {e}")
-    
     def run(self) -> None:
         """Start the application."""
         self.root.mainloop()
@@ -15,13 +15,17 @@ from .providers import MOTDataProvider
 from .types import (
     DataProvider,
     AccessPredictor,
+    ArrayAccessPredictor,
     EvictionPolicy,
+    RankedEvictionPolicy,
     EventCallback,
     EvictionPolicyOldest,
     EvictionPolicyLargest,
     EvictionPolicySmallest,
+    EvictionPolicyTwoRandom,
     MOTDetection,
-    MOTFrameData
+    MOTFrameData,
+    MOT_DETECTION_FIELDS
 )
 
 __version__ = "0.1.2"
@@ -43,17 +47,21 @@ __all__ = [
     # Protocols for custom implementations
     "DataProvider",
     "AccessPredictor", 
+    "ArrayAccessPredictor",
     "EvictionPolicy",
+    "RankedEvictionPolicy",
     "EventCallback",
     
     # Eviction policies
     "EvictionPolicyOldest",
     "EvictionPolicyLargest",
     "EvictionPolicySmallest",
+    "EvictionPolicyTwoRandom",
     
     # Data structures
     "MOTDetection",
     "MOTFrameData",
+    "MOT_DETECTION_FIELDS",
     
     # Package metadata
     "__version__",
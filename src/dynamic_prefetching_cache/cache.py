@@ -90,14 +90,19 @@ cache = DynamicPrefetchingCache(provider, predictor, on_event=on_cache_event)
 See `EventCallback` protocol for complete event documentation.
 """
 
+import os
+import sys
 import time
 import threading
+from array import array
 from collections import deque
-from typing import Any, Optional, Dict, List, Set, Tuple, Type, Deque
+from typing import Any, Callable, Optional, Dict, Iterable, List, Sequence, Set, Tuple, Type, Deque
 from threading import Lock
-import queue
 import logging
 import heapq
+import operator
+import itertools
+import weakref
 
 logger = logging.getLogger('DynamicPrefetchingCache')
 
@@ -111,6 +116,50 @@ from .types import (
     CacheMetrics
 )
 
+# Event names, interned once so emitting doesn't format strings and callbacks
+# comparing against the same literals can match on identity
+_EV_LOAD_START = sys.intern('cache_load_start')
+_EV_LOAD_COMPLETE = sys.intern('cache_load_complete')
+_EV_LOAD_ERROR = sys.intern('cache_load_error')
+_EV_PREFETCH_START = sys.intern('prefetch_start')
+_EV_PREFETCH_SUCCESS = sys.intern('prefetch_success')
+_EV_PREFETCH_ERROR = sys.intern('prefetch_error')
+_EV_EVICT = sys.intern('cache_evict')
+_EV_WORKER_ERROR = sys.intern('worker_error')
+
+# (start, done, error) events for synchronous and prefetch loads
+_LOAD_EVENTS = (_EV_LOAD_START, _EV_LOAD_COMPLETE, _EV_LOAD_ERROR)
+_PREFETCH_EVENTS = (_EV_PREFETCH_START, _EV_PREFETCH_SUCCESS, _EV_PREFETCH_ERROR)
+
+# Keys must fit the signed 64-bit slots of the access history ring buffer
+_KEY_MIN = -(1 << 63)
+_KEY_MAX = (1 << 63) - 1
+
+# Sort key for (key, score) pairs
+_SCORE = operator.itemgetter(1)
+
+
+class _ThreadCounters:
+    """Hit/miss counts written only by the getter thread that owns them."""
+    __slots__ = ('hits', 'misses')
+    
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+
+class _ThreadToken:
+    """Thread-local marker whose collection (its thread exited) retires the thread's counters."""
+    __slots__ = ('__weakref__',)
+
+
+def _retire_counters(lock: Lock, live: Set[_ThreadCounters], retired: _ThreadCounters,
+                     counters: _ThreadCounters) -> None:
+    """Fold an exited thread's counts into `retired` and drop them from the live set."""
+    with lock:
+        live.discard(counters)
+        retired.hits += counters.hits
+        retired.misses += counters.misses
 
 
 class DynamicPrefetchingCache:
@@ -132,12 +181,23 @@ class DynamicPrefetchingCache:
     Additional methods are provided for resource management and monitoring:
     - `close()` or context manager usage for clean shutdown
     - `stats()` for performance metrics and cache state
+    - `reset_stats()` to start a fresh measurement window
     - `on_event` callback for detailed operational events
     
+    ## Eviction
+    
+    Each cached key carries a priority that is only computed when the key is
+    inserted or accessed: the key's likelihood at that moment plus an inflation
+    value that rises to the priority of every evicted entry (GreedyDual style),
+    so entries that are not touched again age out without any global rescoring.
+    Victims come off a heap of these priorities with stale entries skipped
+    lazily; the eviction policy breaks ties between equal priorities.
+    
     ## Thread Safety
     
     - `get()` is safe to call from multiple threads
-    - Internal worker thread handles all background prefetching
+    - Internal worker thread(s) handle all background prefetching; with
+      `prefetch_workers > 1` the provider's load methods run concurrently
     - `close()` is idempotent and thread-safe
     
     ## Usage Examples
@@ -197,7 +257,9 @@ class DynamicPrefetchingCache:
                  eviction_policy: Type[EvictionPolicy] = EvictionPolicyOldest,
                  history_size: int = 30,
                  max_keys_prefetched: int = 20,
-                 on_event: Optional[EventCallback] = None) -> None:
+                 on_event: Optional[EventCallback] = None,
+                 prefetch_workers: int = 1,
+                 low_priority_worker: bool = False) -> None:
         """
         Initialize the Dynamic prefetched cache.
         
@@ -209,36 +271,116 @@ class DynamicPrefetchingCache:
             history_size: Maximum number of recent key accesses to remember for prediction
             max_keys_prefetched: Maximum number of concurrent prefetch operations
             on_event: Optional callback function for cache events
+            prefetch_workers: Number of background threads loading prefetch keys
+                concurrently; values above 1 require a thread-safe provider
+            low_priority_worker: On Linux, lower the worker threads' scheduling
+                priority (nice +5) so prefetching yields CPU to getter threads
         """
         self.provider = provider
         self.predictor = predictor
+        # Predictors implementing ArrayAccessPredictor hand back parallel sequences,
+        # which the prefetch planner can consume without building a dict
+        self._get_likelihoods_arr = getattr(predictor, 'get_likelihoods_arr', None)
+        # Providers with load_batch get several queued prefetch keys per call
+        self._load_batch: Optional[Callable[[List[int]], Dict[int, Any]]] = getattr(
+            provider, 'load_batch', None)
+        # ...and providers with hint are told about keys as soon as they are queued
+        self._hint = getattr(provider, 'hint', None)
         self.max_keys_cached = max_keys_cached
         self.history_size = history_size
         self.max_keys_prefetched = max_keys_prefetched
         self.on_event = on_event
+        self.prefetch_workers = max(1, prefetch_workers)
+        self.low_priority_worker = low_priority_worker
         
         # Set up eviction policy
         self.eviction_policy = eviction_policy()
         
-        # Cache storage
+        # Cache storage. Not pre-sized: dict.clear() drops a pre-grown table and
+        # deletions only keep it until the next resize, which sizes to the live
+        # count, so Python code cannot reserve capacity; growth is amortized O(1).
         self.cache: Dict[int, CacheEntry] = {}
         self.cache_lock = Lock()
         
-        # Access history
-        self.history: Deque[int] = deque(maxlen=history_size)
+        # Lazy eviction queue (guarded by cache_lock). Heap items are
+        # (priority, insert_order, key); an item is live only while it matches
+        # _eviction_priority[key], anything else is a tombstone skipped on pop.
+        self._eviction_heap: List[Tuple[float, int, int]] = []
+        self._eviction_priority: Dict[int, Tuple[float, int]] = {}
+        self._insert_order = itertools.count()
+        self._inflation = 0.0
+        # (key, likelihood) the latest prediction gave the key it was made for
+        # (usually 0), used as its utility when it is accessed or loaded synchronously
+        self._current_key_score: Tuple[Optional[int], float] = (None, 0.0)
+        # EvictionPolicyOldest agrees with the heap's insert_order tie-break
+        self._heap_breaks_ties = type(self.eviction_policy) is EvictionPolicyOldest
+        # For other policies, live entries tied at the lowest priority are moved
+        # off the heap into this pool once and kept there across evictions, so
+        # large groups of ties are not popped and re-pushed for every victim
+        self._tie_pool: Dict[int, Tuple[float, int]] = {}
+        # Policies with a fixed per-entry rank (RankedEvictionPolicy) pick from
+        # the pool through this lazy heap of (rank, insert_order, key) instead;
+        # an item is live only while its key is still in the pool with that order
+        self._eviction_rank = getattr(self.eviction_policy, 'eviction_rank', None)
+        self._tie_heap: List[Tuple[float, int, int]] = []
+        
+        # Access history: a ring buffer of the last history_size keys stored as
+        # machine integers, written at _history_head (guarded by _position_lock)
+        self._history = array('q', [0]) * max(0, history_size)
+        self._history_head = 0
+        self._history_len = 0
         self.current_key: Optional[int] = None
         
+        # Position changes are coalesced: get() records the latest position and
+        # bumps the epoch under _position_lock, and the worker plans prefetching
+        # for whatever position is latest, at most once per epoch it observes.
+        # _plan_lock serializes planning so an older plan never lands after a newer one.
+        self._position_lock = Lock()
+        self._plan_lock = Lock()
+        self._position_epoch = itertools.count(1)
+        self._latest_epoch = 0
+        self._planned_epoch = 0
+        self._pending_rebuild = False
+        
         # Background worker thread
         self.shutdown_flag = threading.Event()
-        self.work_queue: queue.PriorityQueue = queue.PriorityQueue(maxsize=self.max_keys_prefetched*2)
+        # Prefetch work is a bounded FIFO of (key, score) filled in priority order.
+        # deque append/popleft are atomic, so the worker pops without taking
+        # queue_lock; producers set _work_available to wake it up.
+        self.work_queue: Deque[Tuple[int, float]] = deque()
+        self.work_queue_capacity = self.max_keys_prefetched * 2
+        self._work_available = threading.Event()
         self.queued_keys: Set[int] = set()
+        # Keys claimed by a worker and still loading; not queued again meanwhile
+        self._inflight: Set[int] = set()
         self.queue_lock = Lock()
-        self.worker_thread = threading.Thread(target=self._worker_loop, daemon=True)
-        self.worker_thread.start()
-        
-        # Metrics
+        # Workers share the queue; a batch claim takes at most this many keys so
+        # that up to max_keys_prefetched loads are spread across all workers
+        self._batch_limit = max(1, self.max_keys_prefetched // self.prefetch_workers)
+        self.worker_threads = [
+            threading.Thread(target=self._worker_loop, name='dpc-prefetch', daemon=True)
+            for _ in range(self.prefetch_workers)
+        ]
+        self.worker_thread = self.worker_threads[0]
+        for worker in self.worker_threads:
+            worker.start()
+        
+        # Metrics. Hits and misses are counted per getter thread so concurrent
+        # gets don't contend on shared counters; stats() sums them, minus the
+        # totals at the last reset_stats(). Evictions and prefetch errors are
+        # rarer and stay in self.metrics. Only live getter threads stay in the
+        # registry; when one exits, its counts move into _retired_counters.
         self._metrics_lock = Lock()
         self.metrics = CacheMetrics()
+        self._local = threading.local()
+        self._thread_counters: Set[_ThreadCounters] = set()
+        self._retired_counters = _ThreadCounters()
+        self._counters_base = (0, 0)
+        # Exponentially weighted hit ratio over roughly the last 1/alpha gets.
+        # Updated without a lock; a racing update may be lost, which a gauge
+        # like this tolerates.
+        self._ewma_alpha = 0.01
+        self._ewma_hit = 0.5
         
         logger.info(f"DynamicPrefetchingCache initialized: max_keys_cached={max_keys_cached}, max_keys_prefetched={max_keys_prefetched}")
     
@@ -260,87 +402,155 @@ class DynamicPrefetchingCache:
             The data for this key
             
         Raises:
+            ValueError: If the key is outside the signed 64-bit integer range
             Exception: If the provider fails to load the data
         """
         # Update position if changed
         if key != self.current_key:
             self._update_position(key)
         
-        # Check cache first
-        with self.cache_lock:
-            try:
-                entry = self.cache[key]
-                with self._metrics_lock:
-                    self.metrics.hits += 1
-                logger.debug(f"Cache HIT for key {key}")
-                return entry.data
-            except KeyError:
-                pass
+        # Check cache first. Single dict reads are atomic, so a hit needs no
+        # lock unless its eviction priority actually changes, which only happens
+        # after an eviction raised the inflation or the key's score changed. A
+        # key evicted right after the read still returns valid data.
+        entry = self.cache.get(key)
+        if entry is not None:
+            utility = self._current_key_utility(key)
+            stored = self._eviction_priority.get(key)
+            if stored is None or stored[0] != self._inflation + utility:
+                with self.cache_lock:
+                    if key in self.cache:
+                        self._set_eviction_priority(key, utility, new_entry=False)
+            self._counters().hits += 1
+            self._ewma_hit += self._ewma_alpha * (1.0 - self._ewma_hit)
+            logger.debug(f"Cache HIT for key {key}")
+            return entry.data
         
         # Not in cache - load synchronously
-        with self._metrics_lock:
-            self.metrics.misses += 1
+        self._counters().misses += 1
+        self._ewma_hit -= self._ewma_alpha * self._ewma_hit
+        
+        # The miss blocks on the provider anyway, so plan for this position now:
+        # prefetching starts sooner and the key is inserted with its own score
+        if self._planned_epoch != self._latest_epoch:
+            self._update_prefetch()
         
         logger.debug(f"Cache MISS for key {key} - loading synchronously")
         return self._load_and_cache_sync(key)
     
     def _update_position(self, key: int) -> None:
-        """Update current position and trigger dynamic prefetching."""
-        old_key = self.current_key
-        self.current_key = key
-        self.history.append(key)
+        """Update current position and signal the worker to re-plan prefetching."""
+        # Checked before any state changes, so a rejected key leaves the position as it was
+        if not _KEY_MIN <= key <= _KEY_MAX:
+            raise ValueError(f"Key {key} is outside the supported signed 64-bit range")
+        with self._position_lock:
+            old_key = self.current_key
+            self.current_key = key
+            if self._history:
+                self._history[self._history_head] = key
+                self._history_head = (self._history_head + 1) % len(self._history)
+                self._history_len = min(self._history_len + 1, len(self._history))
+            
+            # Detect if this is a jump vs sequential step; a jump anywhere since
+            # the last plan forces the next one to rebuild the queue
+            is_jump = old_key is None or abs(key - old_key) > 1
+            self._pending_rebuild = self._pending_rebuild or is_jump
+            self._latest_epoch = next(self._position_epoch)
         
-        # Detect if this is a jump vs sequential step
-        is_jump = old_key is None or abs(key - old_key) > 1
         if is_jump:
             logger.debug(f"Position jump: {old_key} -> {key} (rebuilding prefetch queue)")
         else:
             logger.debug(f"Position step: {old_key} -> {key}")
         
-        self._update_prefetch(is_rebuild=is_jump)
+        self._work_available.set()
+    
+    def _update_prefetch(self) -> None:
+        """Dynamic prefetch for the latest position: predict once and sync the work queue."""
+        with self._plan_lock:
+            with self._position_lock:
+                if self._planned_epoch == self._latest_epoch:
+                    return  # Another thread planned this position already
+                current_key = self.current_key
+                history = self._ordered_history()
+                is_rebuild = self._pending_rebuild
+                self._pending_rebuild = False
+                self._planned_epoch = self._latest_epoch
+            
+            if current_key is None:
+                return
+            
+            # Calculate what we want to prefetch
+            scored_keys, current_key_score = self._predict_items(current_key, history)
+            desired_keys_with_scores = self._get_desired_keys_with_scores(
+                current_key, current_key_score, scored_keys)
+            
+            # Update work queue efficiently
+            self._sync_work_queue(desired_keys_with_scores, is_rebuild)
     
-    def _update_prefetch(self, is_rebuild: bool = False) -> None:
-        """Dynamic prefetch: calculate what we need and update work queue efficiently."""
-        if self.current_key is None:
-            return
-        
-        # Calculate what we want to prefetch
-        scores = self.predictor.get_likelihoods(self.current_key, list(self.history))
-        desired_keys_with_scores = self._get_desired_keys_with_scores(scores)
-        
-        # Update work queue efficiently
-        self._sync_work_queue(desired_keys_with_scores, is_rebuild)
+    def _current_key_utility(self, key: int) -> float:
+        """Eviction utility for an accessed key: its own score if the latest plan was for it."""
+        scored_key, score = self._current_key_score
+        return score if scored_key == key else 0.0
     
-    def _get_desired_keys_with_scores(self, scores: Dict[int, float]) -> List[Tuple[int, float]]:
+    @property
+    def history(self) -> Tuple[int, ...]:
+        """
+        Recently accessed keys, oldest first, at most history_size long.
+        
+        An immutable snapshot: the history is kept internally and is not
+        changed through this value.
+        """
+        with self._position_lock:
+            return tuple(self._ordered_history())
+    
+    def _ordered_history(self) -> "array[int]":
+        """Unroll the history ring buffer, oldest first. Must be called with _position_lock held."""
+        ring, head = self._history, self._history_head
+        if self._history_len < len(ring):
+            return ring[:head]
+        return ring[head:] + ring[:head]
+    
+    def _predict_items(self, current_key: int,
+                       history: Sequence[int]) -> Tuple[Iterable[Tuple[int, float]], float]:
+        """
+        Predicted (key, score) pairs for current_key, via the array interface if
+        available, plus the score the prediction gives current_key itself.
+        """
+        if self._get_likelihoods_arr is not None:
+            keys, scores = self._get_likelihoods_arr(current_key, history)
+            try:
+                current_key_score = scores[keys.index(current_key)]
+            except ValueError:
+                current_key_score = 0.0
+            return zip(keys, scores), current_key_score
+        likelihoods = self.predictor.get_likelihoods(current_key, history)
+        return likelihoods.items(), likelihoods.get(current_key, 0.0)
+    
+    def _get_desired_keys_with_scores(self, current_key: int, current_key_score: float,
+                                      scored_keys: Iterable[Tuple[int, float]]) -> List[Tuple[int, float]]:
         """Get the keys we want to prefetch with their scores, sorted by priority."""
-        desired_keys: List[Tuple[int, float]] = []
         with self.cache_lock:
-            # Filter out already cached keys first
-            uncached_scores = {k: v for k, v in scores.items() if k not in self.cache}
-            
-            if not uncached_scores:
-                return desired_keys
+            cache = self.cache
+            # The current key's own score is its eviction utility; it may have
+            # been cached before this plan ran
+            self._current_key_score = (current_key, current_key_score)
+            if current_key in cache:
+                self._set_eviction_priority(current_key, current_key_score, new_entry=False)
             
-            # Get only the top keys we actually need for prefetching
-            max_keys_cached_to_fetch = min(
-                self.max_keys_prefetched,  # Max prefetch queue size
-                len(uncached_scores)
-            )
-            
-            if max_keys_cached_to_fetch <= 0:
-                return desired_keys
-            
-            # Use heapq.nlargest for efficient top-k selection
-            # This is much faster than sorting all scores
-            top_items = heapq.nlargest(
-                max_keys_cached_to_fetch, 
-                uncached_scores.items(), 
-                key=lambda x: x[1]
-            )
-            
-            desired_keys = [(key, score) for key, score in top_items]
+            # One pass drops already cached keys
+            uncached_scores = [item for item in scored_keys if item[0] not in cache]
         
-        return desired_keys
+        limit = self.max_keys_prefetched
+        if not uncached_scores or limit <= 0:
+            return []
+        
+        # Highest scores first, earlier keys first among ties. For the few dozen
+        # candidates a predictor usually returns, a stable C sort beats
+        # heapq.nlargest (which gives the same result) by several times.
+        if len(uncached_scores) <= 32 * limit:
+            uncached_scores.sort(key=_SCORE, reverse=True)
+            return uncached_scores[:limit]
+        return heapq.nlargest(limit, uncached_scores, key=_SCORE)
     
     def _sync_work_queue(self, desired_keys_with_scores: List[Tuple[int, float]], is_rebuild: bool = False) -> None:
         """Sync work queue: rebuild completely if is_rebuild, otherwise minimal operations."""
@@ -348,161 +558,349 @@ class DynamicPrefetchingCache:
         
         with self.queue_lock:
             if is_rebuild:
-                self._rebuild_queue(desired_keys_with_scores)
+                added_keys = self._rebuild_queue(desired_keys_with_scores)
             else:
-                self._incremental_sync(desired_keys_with_scores, desired_keys)
+                added_keys = self._incremental_sync(desired_keys_with_scores, desired_keys)
+        
+        # Let the provider start fetching queued keys (e.g. into the OS page
+        # cache) while the worker is still busy with earlier ones
+        if self._hint is not None:
+            for key in added_keys:
+                try:
+                    self._hint(key)
+                except Exception as e:
+                    logger.debug(f"Provider hint failed for key {key}: {e}")
     
-    def _rebuild_queue(self, desired_keys_with_scores: List[Tuple[int, float]]) -> None:
-        """Rebuild the work queue completely. Must be called with queue_lock held."""
+    def _rebuild_queue(self, desired_keys_with_scores: List[Tuple[int, float]]) -> List[int]:
+        """Rebuild the work queue completely, returning the queued keys. Must be called with queue_lock held."""
         # Clear everything
-        while not self.work_queue.empty():
-            try:
-                self.work_queue.get_nowait()
-                self.work_queue.task_done()
-            except queue.Empty:
-                break
+        self.work_queue.clear()
         self.queued_keys.clear()
         
         # Add all keys in priority order (highest score first)
-        added_count = 0
+        added_keys: List[int] = []
         for key, score in desired_keys_with_scores:
-            try:
-                self.work_queue.put_nowait((-score, key))
-                self.queued_keys.add(key)
-                added_count += 1
-            except queue.Full:
+            if key in self._inflight:
+                continue
+            if len(self.work_queue) >= self.work_queue_capacity:
                 break
-        
-        logger.debug(f"Rebuilt prefetch queue: {added_count} keys, top priorities: {[f'{k}({s:.2f})' for k, s in desired_keys_with_scores[:3]]}")
-    
-    def _incremental_sync(self, desired_keys_with_scores: List[Tuple[int, float]], desired_keys: Set[int]) -> None:
-        """Incrementally sync the work queue. Must be called with queue_lock held."""
-        # Remove unwanted keys from tracking
+            self.work_queue.append((key, score))
+            self.queued_keys.add(key)
+            added_keys.append(key)
+        if added_keys:
+            self._work_available.set()
+        
+        logger.debug(f"Rebuilt prefetch queue: {len(added_keys)} keys, top priorities: {[f'{k}({s:.2f})' for k, s in desired_keys_with_scores[:3]]}")
+        return added_keys
+    
+    def _incremental_sync(self, desired_keys_with_scores: List[Tuple[int, float]], desired_keys: Set[int]) -> List[int]:
+        """Incrementally sync the work queue, returning newly queued keys. Must be called with queue_lock held."""
+        # Remove unwanted keys from tracking; their queue slots are skipped by the worker
         unwanted_keys = self.queued_keys - desired_keys
         if unwanted_keys:
             logger.debug(f"Removing {len(unwanted_keys)} unwanted keys from tracking")
         self.queued_keys -= unwanted_keys
         
         # Add new keys in priority order (highest score first)
-        added_count = 0
+        added_keys: List[int] = []
         for key, score in desired_keys_with_scores:
-            if key not in self.queued_keys:
-                try:
-                    self.work_queue.put_nowait((-score, key))
-                    self.queued_keys.add(key)
-                    added_count += 1
-                except queue.Full:
+            if key not in self.queued_keys and key not in self._inflight:
+                if len(self.work_queue) >= self.work_queue_capacity:
                     break
+                self.work_queue.append((key, score))
+                self.queued_keys.add(key)
+                added_keys.append(key)
         
-        if added_count > 0:
-            logger.debug(f"Added {added_count} new keys to prefetch queue")
+        if added_keys:
+            self._work_available.set()
+            logger.debug(f"Added {len(added_keys)} new keys to prefetch queue")
         logger.debug(f"Total queued keys: {len(self.queued_keys)}")
+        return added_keys
     
-    def _load_and_cache(self, key: int, is_prefetch: bool = False) -> Any:
-        """Load data and cache it. Unified method for both sync and prefetch loading."""
-        event_prefix = 'prefetch' if is_prefetch else 'cache_load'
-        self._emit_event(f'{event_prefix}_start', key=key)
+    def _load_and_cache(self, key: int, is_prefetch: bool = False, score: Optional[float] = None) -> Any:
+        """
+        Load data and cache it. Unified method for both sync and prefetch loading.
+        
+        `score` is the likelihood the key was prefetched with; synchronous loads
+        are for the current key and use its score from the latest prediction.
+        """
+        ev_start, ev_done, ev_error = _PREFETCH_EVENTS if is_prefetch else _LOAD_EVENTS
+        if self.on_event is not None:
+            self._emit_event(ev_start, key=key)
         
         try:
             data = self.provider.load(key)
             
             with self.cache_lock:
-                entry = CacheEntry(data=data, timestamp=time.monotonic())
-                self.cache[key] = entry
-                self._evict_if_needed()
+                self._insert_loaded(key, data, self._current_key_utility(key) if score is None else score,
+                                    time.monotonic_ns())
             
-            self._emit_event(f'{event_prefix}_{"success" if is_prefetch else "complete"}', key=key)
+            if self.on_event is not None:
+                self._emit_event(ev_done, key=key)
             return data
             
         except Exception as e:
             if is_prefetch:
                 with self._metrics_lock:
                     self.metrics.prefetch_errors += 1
-            self._emit_event(f'{event_prefix}_error', key=key, error=str(e))
+            if self.on_event is not None:
+                self._emit_event(ev_error, key=key, error=str(e))
             raise
     
     def _load_and_cache_sync(self, key: int) -> Any:
         """Load data synchronously and cache it."""
         return self._load_and_cache(key, is_prefetch=False)
     
+    def _load_batch_and_cache(self, batch: List[Tuple[int, float]]) -> None:
+        """
+        Prefetch several (key, score) pairs with a single provider.load_batch call.
+        
+        If the batch call fails or leaves keys out, those keys are loaded one by
+        one, so a single bad key only fails itself.
+        """
+        keys = [key for key, _ in batch]
+        if self.on_event is not None:
+            for key in keys:
+                self._emit_event(_EV_PREFETCH_START, key=key)
+        
+        load_batch = self._load_batch
+        assert load_batch is not None  # Only batches keys for providers with load_batch
+        try:
+            loaded = load_batch(keys)
+        except Exception as e:
+            logger.debug(f"Batch load of {len(keys)} keys failed, loading individually: {e}")
+            loaded = {}
+        
+        results: List[Tuple[int, float, Any]] = []
+        for key, score in batch:
+            try:
+                data = loaded[key] if key in loaded else self.provider.load(key)
+            except Exception as e:
+                with self._metrics_lock:
+                    self.metrics.prefetch_errors += 1
+                if self.on_event is not None:
+                    self._emit_event(_EV_PREFETCH_ERROR, key=key, error=str(e))
+                logger.debug(f"Prefetch failed for key {key}: {e}")
+                continue
+            results.append((key, score, data))
+        
+        # Entries loaded together share one insertion timestamp
+        now = time.monotonic_ns()
+        with self.cache_lock:
+            for key, score, data in results:
+                self._insert_loaded(key, data, score, now)
+        
+        if self.on_event is not None:
+            for key, _, _ in results:
+                self._emit_event(_EV_PREFETCH_SUCCESS, key=key)
+    
+    def _insert_loaded(self, key: int, data: Any, utility: float, timestamp: int) -> None:
+        """Cache freshly loaded data and evict if over the limit. Must be called with cache_lock held."""
+        self.cache[key] = CacheEntry(data, timestamp)
+        self._set_eviction_priority(key, utility)
+        self._evict_if_needed()
+    
+    def _claim_prefetch_batch(self, key: int, score: float) -> List[Tuple[int, float]]:
+        """
+        Claim a popped work item, plus further queued items up to this worker's
+        share of max_keys_prefetched when the provider can load them in one batch.
+        
+        Claimed items move from queued_keys to _inflight until _release_batch;
+        items dropped by a later sync are no longer wanted and are skipped.
+        """
+        limit = self._batch_limit if self._load_batch is not None else 1
+        batch: List[Tuple[int, float]] = []
+        with self.queue_lock:
+            while True:
+                if key in self.queued_keys:
+                    self.queued_keys.discard(key)
+                    self._inflight.add(key)
+                    batch.append((key, score))
+                    if len(batch) >= limit:
+                        break
+                try:
+                    key, score = self.work_queue.popleft()
+                except IndexError:
+                    break
+        return batch
+    
+    def _release_batch(self, batch: List[Tuple[int, float]]) -> None:
+        """Mark claimed keys as no longer loading, whether they succeeded or failed."""
+        with self.queue_lock:
+            self._inflight.difference_update(key for key, _ in batch)
+    
     def _worker_loop(self) -> None:
         """Single worker thread that loads data in background."""
+        # Linux applies nice() to the calling thread only; elsewhere it would
+        # lower the whole process, so the knob is ignored there
+        if self.low_priority_worker and sys.platform.startswith('linux'):
+            try:
+                os.nice(5)
+            except OSError as e:
+                logger.debug(f"Could not lower prefetch worker priority: {e}")
+        
         while not self.shutdown_flag.is_set():
             try:
+                # Plan for the latest position before each load, so a burst of
+                # position changes costs one predictor call rather than one each
+                if self._planned_epoch != self._latest_epoch:
+                    self._update_prefetch()
+                
                 try:
-                    # Use shorter timeout to check shutdown flag more frequently
-                    priority_item = self.work_queue.get(timeout=0.5)
-                    # Extract key from priority tuple (negative_score, key)
-                    key = priority_item[1]
-                    score = -priority_item[0]
-                    logger.debug(f"Loading key {key} (priority score: {score:.2f})")
-                except queue.Empty:
+                    key, score = self.work_queue.popleft()
+                except IndexError:
+                    # Clear, then re-check, so a producer's set() between the two is not lost
+                    self._work_available.clear()
+                    if not self.work_queue and self._planned_epoch == self._latest_epoch:
+                        # Use shorter timeout to check shutdown flag more frequently
+                        self._work_available.wait(timeout=0.5)
                     continue
                 
-                # Remove from tracking as soon as we get it
-                with self.queue_lock:
-                    self.queued_keys.discard(key)
-                
-                # Check shutdown flag before potentially blocking provider.load()
-                if self.shutdown_flag.is_set():
-                    # Put the item back in queue for clean shutdown
-                    self.work_queue.task_done()
-                    break
+                batch = self._claim_prefetch_batch(key, score)
+                if not batch:
+                    continue
                 
                 try:
-                    self._load_and_cache(key, is_prefetch=True)
-                except Exception as e:
-                    # Error handling and event emission is already done in _load_and_cache
-                    # Just log for debugging purposes
-                    logger.debug(f"Prefetch failed for key {key}: {e}")
-                
-                self.work_queue.task_done()
+                    # Check shutdown flag before potentially blocking provider.load()
+                    if self.shutdown_flag.is_set():
+                        break
+                    
+                    if len(batch) > 1:
+                        logger.debug(f"Loading batch of {len(batch)} keys: {[k for k, _ in batch]}")
+                        self._load_batch_and_cache(batch)
+                        continue
+                    
+                    key, score = batch[0]
+                    logger.debug(f"Loading key {key} (priority score: {score:.2f})")
+                    try:
+                        self._load_and_cache(key, is_prefetch=True, score=score)
+                    except Exception as e:
+                        # Error handling and event emission is already done in _load_and_cache
+                        # Just log for debugging purposes
+                        logger.debug(f"Prefetch failed for key {key}: {e}")
+                finally:
+                    self._release_batch(batch)
                 
             except Exception as e:
-                self._emit_event('worker_error', error=str(e))
+                self._emit_event(_EV_WORKER_ERROR, error=str(e))
+    
+    def _set_eviction_priority(self, key: int, utility: float, new_entry: bool = True) -> None:
+        """Queue key for eviction at inflation + utility. Must be called with cache_lock held."""
+        if new_entry or key not in self._eviction_priority:
+            order = next(self._insert_order)
+        else:
+            order = self._eviction_priority[key][1]
+        priority = self._inflation + utility
+        self._eviction_priority[key] = (priority, order)
+        self._tie_pool.pop(key, None)
+        heapq.heappush(self._eviction_heap, (priority, order, key))
+        
+        # Re-accessed keys leave tombstones behind; rebuild once they dominate
+        if len(self._eviction_heap) > 2 * len(self._eviction_priority) + 64:
+            pool = self._tie_pool
+            self._eviction_heap = [(p, o, k) for k, (p, o) in self._eviction_priority.items()
+                                   if k not in pool]
+            heapq.heapify(self._eviction_heap)
     
     def _evict_if_needed(self) -> None:
         """Evict entries if over key limit. Must be called with cache_lock held."""
-        if not self.cache or len(self.cache) <= self.max_keys_cached:
-            return
-        
-        # Calculate scores once for all evictions
-        scores = {}
-        if self.current_key is not None:
-            scores = self.predictor.get_likelihoods(self.current_key, list(self.history))
-        
-        # Evict multiple items using the same scores
         while self.cache and len(self.cache) > self.max_keys_cached:
-            victim_key = self._pick_eviction_victim(scores)
+            victim_key = self._pick_eviction_victim()
             _ = self.cache.pop(victim_key)
             
             with self._metrics_lock:
                 self.metrics.evictions += 1
             
             logger.debug(f"Evicted key {victim_key} (cache limit: {self.max_keys_cached})")
-            self._emit_event('cache_evict', key=victim_key)
+            if self.on_event is not None:
+                self._emit_event(_EV_EVICT, key=victim_key)
     
-    def _pick_eviction_victim(self, scores: Dict[int, float]) -> int:
-        """Pick victim: lowest likelihood first, eviction policy as tie-breaker."""
-        if not scores:
-            victim = self.eviction_policy.pick_victim(self.cache, {})
-            return int(victim)
+    def _pick_eviction_victim(self) -> int:
+        """
+        Pop the lowest-priority live key, with the eviction policy as tie-breaker.
+        Must be called with cache_lock held.
+        """
+        heap = self._eviction_heap
+        live = self._eviction_priority
+        tied = self._tie_pool
         
-        # Find keys with minimum likelihood score
-        cached_scores = {key: scores.get(key, 0.0) for key in self.cache.keys()}
-        min_score = min(cached_scores.values())
-        tied_keys = [key for key, score in cached_scores.items() if score == min_score]
+        # Drop tombstones until the top of the heap is live
+        while heap and live.get(heap[0][2]) != heap[0][:2]:
+            heapq.heappop(heap)
         
-        if len(tied_keys) == 1:
-            return tied_keys[0]
+        if self._heap_breaks_ties:
+            priority, _, victim = heapq.heappop(heap)
         else:
-            # Use eviction policy as tie-breaker
-            tied_cache = {key: self.cache[key] for key in tied_keys}
-            tied_scores = {key: scores.get(key, 0.0) for key in tied_keys}
-            victim = self.eviction_policy.pick_victim(tied_cache, tied_scores)
-            return int(victim)
-    
-    def stats(self) -> Dict[str, int]:
+            # Everything still in the pool is live, and nothing can be queued
+            # below it: new priorities start at the inflation, which is never
+            # above the pool's priority. Top it up with any equal-priority keys
+            # from the heap and let the policy choose among them.
+            rank = self._eviction_rank
+            tie_heap = self._tie_heap
+            if tied:
+                priority = next(iter(tied.values()))[0]
+                if heap and heap[0][0] < priority:
+                    # Only reachable with negative scores: hand the pool back
+                    for key, (p, order) in tied.items():
+                        heapq.heappush(heap, (p, order, key))
+                    tied.clear()
+                    tie_heap.clear()
+            if not tied:
+                priority = heap[0][0]
+            cache = self.cache
+            while heap and heap[0][0] == priority:
+                _, order, key = heapq.heappop(heap)
+                if live.get(key) == (priority, order):
+                    tied[key] = (priority, order)
+                    if rank is not None:
+                        heapq.heappush(tie_heap, (rank(cache[key]), order, key))
+            if rank is not None:
+                # Drop items of keys that left the pool since they were ranked
+                while tied.get(tie_heap[0][2], (0.0, -1))[1] != tie_heap[0][1]:
+                    heapq.heappop(tie_heap)
+                victim = heapq.heappop(tie_heap)[2]
+                if len(tie_heap) > 2 * len(tied) + 64:
+                    tie_heap[:] = [item for item in tie_heap
+                                   if tied.get(item[2], (0.0, -1))[1] == item[1]]
+                    heapq.heapify(tie_heap)
+            elif len(tied) == 1:
+                victim = next(iter(tied))
+            else:
+                victim = int(self.eviction_policy.pick_victim(
+                    {key: cache[key] for key in tied},
+                    dict.fromkeys(tied, priority)
+                ))
+            del tied[victim]
+        
+        del live[victim]
+        self._inflation = priority
+        return victim
+    
+    def _counters(self) -> _ThreadCounters:
+        """Hit/miss counters of the calling thread, registered on first use."""
+        try:
+            counters: _ThreadCounters = self._local.counters
+            return counters
+        except AttributeError:
+            counters = self._local.counters = _ThreadCounters()
+            with self._metrics_lock:
+                self._thread_counters.add(counters)
+            # The thread-local token dies with the thread; the finalizer holds
+            # the counters themselves (not the cache) and retires them then
+            token = self._local.token = _ThreadToken()
+            weakref.finalize(token, _retire_counters, self._metrics_lock,
+                             self._thread_counters, self._retired_counters, counters).atexit = False
+            return counters
+    
+    def _counter_totals(self) -> Tuple[int, int]:
+        """Hits and misses summed over all threads. Must be called with _metrics_lock held."""
+        hits, misses = self._retired_counters.hits, self._retired_counters.misses
+        for counters in self._thread_counters:
+            hits += counters.hits
+            misses += counters.misses
+        return hits, misses
+    
+    def stats(self) -> Dict[str, float]:
         """
         Get a snapshot of current cache statistics and metrics.
         
@@ -513,31 +911,49 @@ class DynamicPrefetchingCache:
             - evictions: Number of items evicted due to key limits
             - prefetch_errors: Number of prefetch operations that failed
             - cache_keys: Current number of items in cache
-            - active_prefetch_tasks: Number of currently running prefetch tasks        
+            - active_prefetch_tasks: Number of currently running prefetch tasks
+            - hit_ratio_ewma: Recent hit ratio, weighted towards the last ~100 gets
         """
         with self._metrics_lock:
+            hits, misses = self._counter_totals()
+            base_hits, base_misses = self._counters_base
             return {
-                'hits': self.metrics.hits,
-                'misses': self.metrics.misses,
+                'hits': hits - base_hits,
+                'misses': misses - base_misses,
                 'evictions': self.metrics.evictions,
                 'prefetch_errors': self.metrics.prefetch_errors,
                 'cache_keys': len(self.cache),
-                'active_prefetch_tasks': self.work_queue.qsize()
+                'active_prefetch_tasks': len(self.work_queue),
+                'hit_ratio_ewma': self._ewma_hit
             }
     
+    def reset_stats(self) -> None:
+        """
+        Reset the hit, miss, eviction and prefetch error counters and the hit ratio gauge.
+        
+        Cached data, history and the prefetch queue are left untouched, so the
+        same cache can be reused across several measurement runs.
+        """
+        with self._metrics_lock:
+            self.metrics = CacheMetrics()
+            self._counters_base = self._counter_totals()
+            self._ewma_hit = 0.5
+    
     def close(self) -> None:
         """Close the cache and clean up resources."""
         logger.info("Closing DynamicPrefetchingCache...")
         self.shutdown_flag.set()
+        self._work_available.set()  # Wake idle workers so they see the flag
         
-        # Give worker thread time to finish current task and exit cleanly
-        if self.worker_thread.is_alive():
-            self.worker_thread.join(timeout=2.0)
-            
-            # If thread is still alive, it's likely blocked in provider.load()
-            if self.worker_thread.is_alive():
-                logger.warning("Worker thread did not exit cleanly - provider may be blocking indefinitely")
-                logger.warning("Consider implementing timeout or cancellation in your DataProvider.load() method")
+        # Give worker threads time to finish current task and exit cleanly
+        for worker in self.worker_threads:
+            if worker.is_alive():
+                worker.join(timeout=2.0)
+                
+                # If thread is still alive, it's likely blocked in provider.load()
+                if worker.is_alive():
+                    logger.warning("Worker thread did not exit cleanly - provider may be blocking indefinitely")
+                    logger.warning("Consider implementing timeout or cancellation in your DataProvider.load() method")
         
         logger.info("DynamicPrefetchingCache closed")
     
@@ -561,10 +977,11 @@ class DynamicPrefetchingCache:
             pass  # Ignore errors during cleanup
     
     def _emit_event(self, event_name: str, **kwargs: Any) -> None:
-        """Emit event to callback if configured."""
-        if self.on_event:
+        """Emit event to callback if configured. Hot paths check on_event first to skip the call."""
+        on_event = self.on_event
+        if on_event is not None:
             try:
-                self.on_event(event_name, **kwargs)
+                on_event(event_name, **kwargs)
             except Exception as e:
                 logger.warning(f"Error emitting event {event_name}: {e}")
                 pass
@@ -1,58 +1,72 @@
 from __future__ import annotations
 
-from collections import defaultdict
-from typing import Sequence, Dict, List, Optional
+import functools
+from typing import Sequence, Dict, List, Optional, Tuple
 
-from .types import AccessPredictor
+from .types import AccessPredictor, ArrayAccessPredictor
 
 
-class DistanceDecayPredictor(AccessPredictor):
+class DistanceDecayPredictor(ArrayAccessPredictor):
     """Simple predictor based on distance decay from current position."""
     
     def __init__(self, max_span: int = 60, decay: float = 1.5):
         self.max_span = max_span
         self.decay = decay
+        # The curve only shifts with `current`, so compute it once
+        self._weights = tuple(1 / (abs(d) + 1) ** decay for d in range(-max_span, max_span + 1))
     
     def get_likelihoods(self, current: int, history: Sequence[int]) -> dict[int, float]:
         """Return likelihood scores based on distance from current key."""
-        keys = {current + d for d in range(-self.max_span, self.max_span + 1)}
-        return {k: 1 / (abs(k - current) + 1) ** self.decay for k in keys}
+        return dict(zip(*self.get_likelihoods_arr(current, history)))
+    
+    def get_likelihoods_arr(self, current: int, history: Sequence[int]) -> Tuple[range, Tuple[float, ...]]:
+        """Return (keys, scores) without building a dict; scores is the shared template."""
+        return range(current - self.max_span, current + self.max_span + 1), self._weights
 
 
-class DynamicDistanceDecayPredictor(AccessPredictor):
+class DynamicDistanceDecayPredictor(ArrayAccessPredictor):
     """Predicts data playback patterns with forward bias."""
     
     def __init__(self, forward_bias: float = 2.0, max_span: int = 25):
         self.forward_bias = forward_bias
         self.max_span = max_span
+        # Offset templates: plain forward curve, the same curve with the recent
+        # forward-movement boost applied to the first 9 steps, and the backward curve
+        self._forward_weights = tuple(forward_bias / (i ** 0.8) for i in range(1, max_span + 1))
+        self._boosted_forward_weights = tuple(
+            w * 1.5 if i < 10 else w for i, w in enumerate(self._forward_weights, start=1)
+        )
+        self._backward_weights = tuple(0.3 / (i ** 1.2) for i in range(1, max_span // 2 + 1))
+        # Complete score sequences for positions with the full backward span,
+        # indexed by moving_forward, so those calls hand back a shared tuple
+        reversed_backward = self._backward_weights[::-1]
+        self._full_weights = (
+            reversed_backward + self._forward_weights,
+            reversed_backward + self._boosted_forward_weights,
+        )
     
     def get_likelihoods(self, current: int, history: Sequence[int]) -> dict[int, float]:
         """Generate likelihood scores with forward playback bias."""
-        scores = {}
-        
-        # Strong forward bias for normal playback
-        for i in range(1, self.max_span + 1):
-            key = current + i
-            scores[key] = self.forward_bias / (i ** 0.8)
-        
-        # Weaker backward bias for seeks
-        for i in range(1, min(self.max_span // 2, current) + 1):
-            key = current - i
-            scores[key] = 0.3 / (i ** 1.2)
-        
-        # Boost likelihood for recent history patterns
-        if len(history) >= 2:
-            recent_direction = history[-1] - history[-2]
-            if recent_direction > 0:  # Forward movement
-                for i in range(1, 10):
-                    key = current + i
-                    if key in scores:
-                        scores[key] *= 1.5
+        return dict(zip(*self.get_likelihoods_arr(current, history)))
+    
+    def get_likelihoods_arr(self, current: int, history: Sequence[int]) -> Tuple[List[int], Tuple[float, ...]]:
+        """Return (keys, scores) in ascending key order, skipping `current` itself."""
+        # Boost likelihood for recent history patterns (forward movement)
+        moving_forward = len(history) >= 2 and history[-1] > history[-2]
         
-        return scores
+        # Weaker backward bias for seeks, then strong forward bias for normal playback
+        back_span = max(0, min(self.max_span // 2, current))
+        keys = list(range(current - back_span, current))
+        keys.extend(range(current + 1, current + self.max_span + 1))
+        if back_span == len(self._backward_weights):
+            return keys, self._full_weights[moving_forward]
+        forward_weights = self._boosted_forward_weights if moving_forward else self._forward_weights
+        if not back_span:
+            return keys, forward_weights
+        return keys, self._backward_weights[back_span - 1::-1] + forward_weights
     
 
-class DynamicDataPredictor(AccessPredictor):
+class DynamicDataPredictor(ArrayAccessPredictor):
     """
     Probabilistic next-frame predictor for interactive media playback.
 
@@ -79,6 +93,10 @@ class DynamicDataPredictor(AccessPredictor):
     proximity_range : int, default 3
     length : Optional[int], default None
         Total number of frames (if known).  Predictions beyond this are clipped.
+
+    The parameters are fixed at construction (scores are precomputed from
+    them), so they are exposed as read-only properties; build a new predictor
+    to change them.
     """
 
     def __init__(
@@ -96,63 +114,140 @@ class DynamicDataPredictor(AccessPredictor):
         proximity_range: int = 5,
         length: Optional[int] = None,
     ):
-        self.possible_jumps = possible_jumps
-        self.forward_bias = forward_bias
-        self.backward_bias = backward_bias
-        self.jump_boost = jump_boost
-        self.proximity_boost = proximity_boost
-        self.history_boost = history_boost
-        self.max_span = max_span
-        self.forward_exp = forward_exp
-        self.backward_exp = backward_exp
-        self.proximity_range = proximity_range
-        self.length = length
-
-    def _clip(self, frame: int) -> bool:
-        """Return True if frame is within [0, length) (or always True if length=None)."""
-        if frame < 0:
-            return False
-        return self.length is None or frame < self.length
+        self._possible_jumps = tuple(possible_jumps)
+        self._forward_bias = forward_bias
+        self._backward_bias = backward_bias
+        self._jump_boost = jump_boost
+        self._proximity_boost = proximity_boost
+        self._history_boost = history_boost
+        self._max_span = max_span
+        self._forward_exp = forward_exp
+        self._backward_exp = backward_exp
+        self._proximity_range = proximity_range
+        self._length = length
+
+        # Every distance-dependent weight depends only on the constructor
+        # arguments, so build them once instead of on every call.
+        self._forward_weights = [forward_bias / (d ** forward_exp) for d in range(1, max_span + 1)]
+        self._backward_weights = [backward_bias / (d ** backward_exp) for d in range(1, max_span // 2 + 1)]
+        self._proximity_weights = [
+            (off, proximity_boost / (abs(off) + 1))
+            for off in range(-proximity_range, proximity_range + 1)
+            if off != 0
+        ]
+
+        # Scores only depend on `current` and whether history shows a forward
+        # streak. Away from frame 0 and `length` nothing is clipped, so they are
+        # one fixed (offsets, scores) template per streak flag, shifted by
+        # `current`; nearer the edges results are memoized per position.
+        min_jump = min(possible_jumps, default=0)
+        max_jump = max(possible_jumps, default=0)
+        self._interior_start = max(max_span // 2, proximity_range - min_jump, 0)
+        self._interior_end = (
+            float("inf") if length is None
+            else min(length - max_span, length - max_jump - proximity_range)
+        )
+        self._templates: Dict[bool, Tuple[Tuple[int, ...], Tuple[float, ...]]] = {}
+        self._edge_scores = functools.lru_cache(maxsize=128)(self._scores_at)
+
+    @property
+    def possible_jumps(self) -> Tuple[int, ...]:
+        return self._possible_jumps
+
+    @property
+    def forward_bias(self) -> float:
+        return self._forward_bias
+
+    @property
+    def backward_bias(self) -> float:
+        return self._backward_bias
+
+    @property
+    def jump_boost(self) -> float:
+        return self._jump_boost
+
+    @property
+    def proximity_boost(self) -> float:
+        return self._proximity_boost
+
+    @property
+    def history_boost(self) -> float:
+        return self._history_boost
+
+    @property
+    def max_span(self) -> int:
+        return self._max_span
+
+    @property
+    def forward_exp(self) -> float:
+        return self._forward_exp
+
+    @property
+    def backward_exp(self) -> float:
+        return self._backward_exp
+
+    @property
+    def proximity_range(self) -> int:
+        return self._proximity_range
+
+    @property
+    def length(self) -> Optional[int]:
+        return self._length
 
     def get_likelihoods(self, current: int, history: Sequence[int]) -> Dict[int, float]:
-        scores: Dict[int, float] = defaultdict(float)
-
-        # Forward bias
-        for d in range(1, self.max_span + 1):
-            f = current + d
-            if self._clip(f):
-                scores[f] += self.forward_bias / (d ** self.forward_exp)
+        return dict(zip(*self.get_likelihoods_arr(current, history)))
+
+    def get_likelihoods_arr(self, current: int, history: Sequence[int]) -> Tuple[List[int], Tuple[float, ...]]:
+        """Return (keys, scores) with the same contents as `get_likelihoods`."""
+        streak = len(history) >= 3 and history[-3] < history[-2] < history[-1]
+        if self._interior_start <= current < self._interior_end:
+            template = self._templates.get(streak)
+            if template is None:
+                origin = self._interior_start
+                keys, scores = self._scores_at(origin, streak)
+                template = self._templates[streak] = (tuple(k - origin for k in keys), scores)
+            offsets, scores = template
+            return list(map(current.__add__, offsets)), scores
+        keys, scores = self._edge_scores(current, streak)
+        return list(keys), scores
+
+    def _scores_at(self, current: int, streak: bool) -> Tuple[Tuple[int, ...], Tuple[float, ...]]:
+        """Build the scores for one position from scratch."""
+        upper = self._length if self._length is not None else float("inf")
+
+        # Forward bias: the clipped run of frames maps onto a slice of the template
+        first = max(1, -current)
+        last = self._max_span if self._length is None else min(self._max_span, self._length - 1 - current)
+        scores: Dict[int, float] = dict(
+            zip(range(current + first, current + last + 1), self._forward_weights[first - 1:last])
+        )
 
         # Backward bias
-        back_span = min(self.max_span // 2, current)
-        for d in range(1, back_span + 1):
-            f = current - d
-            scores[f] += self.backward_bias / (d ** self.backward_exp)
+        back_span = min(self._max_span // 2, current)
+        if back_span > 0:
+            scores.update(zip(range(current - 1, current - back_span - 1, -1), self._backward_weights))
 
         # Exact jump destinations
-        for j in self.possible_jumps:
-            tgt = current + j
-            if self._clip(tgt):
-                scores[tgt] += self.jump_boost
+        targets = [current + j for j in self._possible_jumps]
+        targets = [tgt for tgt in targets if 0 <= tgt < upper]
+        jump_boost = self._jump_boost
+        get = scores.get
+        for tgt in targets:
+            scores[tgt] = get(tgt, 0.0) + jump_boost
 
         # Proximity to jump targets
-        for j in self.possible_jumps:
-            tgt = current + j
-            if not self._clip(tgt):
-                continue
-            for off in range(-self.proximity_range, self.proximity_range + 1):
-                if off == 0:
-                    continue
+        proximity_weights = self._proximity_weights
+        for tgt in targets:
+            for off, weight in proximity_weights:
                 f = tgt + off
-                if self._clip(f):
-                    scores[f] += self.proximity_boost / (abs(off) + 1)
+                if 0 <= f < upper:
+                    scores[f] = get(f, 0.0) + weight
 
         # Recent-history forward streak boost
-        if len(history) >= 3:
-            if all(history[i] < history[i + 1] for i in (-3, -2)):
-                for d in range(1, min(10, self.max_span) + 1):
-                    f = current + d
-                    if f in scores:
-                        scores[f] *= self.history_boost
-
-        return dict(scores)
\ No newline at end of file
+        if streak:
+            history_boost = self._history_boost
+            for f in range(current + 1, current + min(10, self._max_span) + 1):
+                if f in scores:
+                    scores[f] *= history_boost
+
+        return tuple(scores), tuple(scores.values())
@@ -4,6 +4,7 @@ MOT DataProvider - High-Performance Implementation
 Optimized implementation with:
 - File position indexing (byte offsets for O(1) access)
 - LRU caching for frequently accessed frames
+- Raw prefetching: lines read ahead are only parsed when first loaded
 - Batch loading capabilities
 - Efficient file seeking instead of sequential reads
 
@@ -17,12 +18,49 @@ The data provider is optimized for the following use cases:
 - Large datasets (e.g. < 100000 frames)
 """
 
+import mmap
+import os
 import sys
 import time
-from typing import List, Dict, Set, Any, Optional, Tuple
+from array import array
+from typing import Iterator, List, Dict, Set, Any, Optional, Tuple
 from collections import OrderedDict
 
-from .types import DataProvider, MOTDetection, MOTFrameData
+from .types import DataProvider, MOTFrameData
+
+# Block size for the binary scan that builds the frame index
+INDEX_READ_SIZE = 1 << 22
+
+# load_batch reads lines separated by at most this many bytes with one read
+BATCH_READ_MAX_GAP = 1 << 16
+
+
+def _parse_detection_bytes(line: bytes) -> Tuple[float, ...]:
+    """
+    Parse one raw detection line into a MOTFrameData row.
+    
+    Works on the bytes read from the file, without decoding to str first;
+    int() and float() accept ASCII digits and ignore surrounding whitespace
+    (including a trailing carriage return), so no strip is needed either.
+
+    Kept in pure Python on purpose: the package ships without compiled
+    extensions, and the per-field int()/float() conversions (already C code)
+    dominate; the stdlib C csv reader with numeric conversion is no faster.
+    """
+    # The schema has exactly 9 columns, so unpack them directly; a wrong
+    # field count fails the unpack instead of needing a separate length check.
+    # split() already finds the commas in one C-level scan, so validating with
+    # bytes.count(b',') first would only scan each line twice.
+    try:
+        (frame, track_id, bb_left, bb_top, bb_width, bb_height,
+         confidence, class_id, visibility_ratio) = line.split(b',')
+    except ValueError:
+        raise ValueError("Invalid line format") from None
+
+    return (
+        int(frame), int(track_id), float(bb_left), float(bb_top), float(bb_width),
+        float(bb_height), float(confidence), int(class_id), float(visibility_ratio)
+    )
 
 
 class MOTDataProvider(DataProvider):
@@ -33,14 +71,22 @@ class MOTDataProvider(DataProvider):
         self.cache_size = cache_size
         self.statistics: Dict[str, float] = {}
         
-        # Optimized index: frame_number -> list of (byte_offset, line_length)
-        self.frame_index: Dict[int, List[Tuple[int, int]]] = {}
+        # Optimized index: frame_number -> (first, end) row range in the line
+        # columns below, which hold each indexed line's byte offset and length.
+        # Rows are grouped by frame and in file order within a frame.
+        self.frame_index: Dict[int, Tuple[int, int]] = {}
+        self._line_offsets: 'array[int]' = array('q')
+        self._line_lengths: 'array[int]' = array('i')
         
         # LRU cache for recently loaded frames
         self.frame_cache: OrderedDict[int, MOTFrameData] = OrderedDict()
+        # LRU cache for prefetched frames, as their unparsed lines joined by b'\n'
+        self.raw_cache: OrderedDict[int, bytes] = OrderedDict()
         
-        # Keep file handle open for efficient seeking
-        self._file_handle: Optional[Any] = None
+        # Raw file descriptor and a read-only map of the whole file, opened on
+        # first use; _mmap stays None where the file cannot be mapped (e.g. empty)
+        self._fd: Optional[int] = None
+        self._mmap: Optional[mmap.mmap] = None
         
         self._build_optimized_index()
 
@@ -48,98 +94,213 @@ class MOTDataProvider(DataProvider):
         """Build optimized index with byte offsets for O(1) file access."""
         start_time = time.time()
         
-        with open(self.data_file, 'r') as f:
-            byte_offset = 0
-            
-            for line in f:
-                line_length = len(line.encode('utf-8'))
-                line_content = line.strip()
+        offsets = self._line_offsets
+        lengths = self._line_lengths
+        append_offset = offsets.append
+        append_length = lengths.append
+        
+        # Lines are appended to the columns in file order; each stretch of
+        # consecutive lines with the same frame is one run of (frame, first_row)
+        runs: List[Tuple[int, int]] = []
+        frame = None
+        byte_offset = 0  # File offset of the first line in `lines`
+        tail = b''
+        
+        # Read raw bytes in large blocks and split them into lines in C, instead
+        # of decoding and re-encoding every line; a partial last line is carried
+        # over to the next block
+        with open(self.data_file, 'rb') as f:
+            while True:
+                block = f.read(INDEX_READ_SIZE)
+                lines = (tail + block).split(b'\n')
+                tail = lines.pop() if block else b''
                 
-                if line_content:
-                    try:
-                        # Parse only the frame number (first field)
-                        frame = int(line_content.split(',')[0])
-                        
-                        if frame not in self.frame_index:
-                            self.frame_index[frame] = []
+                last_head = None
+                for line in lines:
+                    line_content = line.strip()
+                    
+                    if line_content:
+                        # Parse only the frame number (first field); lines of
+                        # one frame are usually adjacent, so skip re-parsing it
+                        head = line_content.split(b',', 1)[0]
+                        if head != last_head:
+                            try:
+                                line_frame = int(head)
+                            except ValueError:
+                                byte_offset += len(line) + 1
+                                continue  # Skip invalid lines
+                            last_head = head
+                            if line_frame != frame:
+                                frame = line_frame
+                                runs.append((frame, len(offsets)))
                         
                         # Store byte offset and length for direct seeking
-                        self.frame_index[frame].append((byte_offset, len(line_content)))
-                        
-                    except (ValueError, IndexError):
-                        pass  # Skip invalid lines
+                        append_offset(byte_offset)
+                        append_length(len(line_content))
+                    
+                    byte_offset += len(line) + 1
                 
-                byte_offset += line_length
+                if not block:
+                    break
+        
+        self._index_runs(runs)
         
         self.statistics['index_build_time'] = time.time() - start_time
         self.statistics['total_frames_indexed'] = len(self.frame_index)
+        # The index is fixed from here on, so get_stats() can reuse these
+        self.statistics['total_indexed_lines'] = len(self._line_offsets)
+        self.statistics['index_memory_bytes'] = (
+            sys.getsizeof(self.frame_index)
+            + sys.getsizeof(self._line_offsets)
+            + sys.getsizeof(self._line_lengths)
+        )
     
-    def _get_file_handle(self) -> Any:
-        """Get or create file handle for efficient seeking."""
-        if self._file_handle is None or self._file_handle.closed:
-            self._file_handle = open(self.data_file, 'r')
-        return self._file_handle
-    
-    def _parse_detection_line_fast(self, line: str) -> MOTDetection:
-        """Optimized parsing with reduced overhead."""
-        parts = line.split(',')
-        if len(parts) != 9:
-            raise ValueError("Invalid line format")
-
-        # Direct conversion without intermediate variables
-        return MOTDetection(
-            frame=int(parts[0]),
-            track_id=int(parts[1]),
-            bb_left=float(parts[2]),
-            bb_top=float(parts[3]),
-            bb_width=float(parts[4]),
-            bb_height=float(parts[5]),
-            confidence=float(parts[6]),
-            class_id=int(parts[7]),
-            visibility_ratio=float(parts[8])
+    def _index_runs(self, runs: List[Tuple[int, int]]) -> None:
+        """Fill frame_index from the (frame, first_row) runs found while scanning."""
+        frame_index = self.frame_index
+        total = len(self._line_offsets)
+        ends = [first for _, first in runs[1:]] + [total]
+        
+        if all(a[0] < b[0] for a, b in zip(runs, runs[1:])):
+            # Frames appear in increasing order, each in a single run (the
+            # usual MOT layout): the rows are already grouped
+            for (frame, first), end in zip(runs, ends):
+                frame_index[frame] = (first, end)
+            return
+        
+        # Otherwise regroup: move each frame's runs together, ordered by frame
+        # and then by file position, copying rows a run (slice) at a time
+        offsets = self._line_offsets
+        lengths = self._line_lengths
+        grouped_offsets: 'array[int]' = array('q')
+        grouped_lengths: 'array[int]' = array('i')
+        for (frame, first), end in sorted(zip(runs, ends)):
+            start = frame_index[frame][0] if frame in frame_index else len(grouped_offsets)
+            grouped_offsets.extend(offsets[first:end])
+            grouped_lengths.extend(lengths[first:end])
+            frame_index[frame] = (start, len(grouped_offsets))
+        self._line_offsets = grouped_offsets
+        self._line_lengths = grouped_lengths
+    
+    def _get_fd(self) -> int:
+        """Get or open the raw file descriptor used for reads."""
+        if self._fd is None:
+            fd = os.open(self.data_file, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+            try:
+                self._mmap = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError, OverflowError):
+                self._mmap = None  # Empty or unmappable file: use pread
+            self._fd = fd
+        return self._fd
+    
+    def _parse_detection_line_fast(self, line: str) -> Tuple[float, ...]:
+        """Parse one detection line into a MOTFrameData row."""
+        return _parse_detection_bytes(line.encode('utf-8'))
+    
+    def _read_span(self, start: int, length: int) -> bytes:
+        """Read `length` raw bytes at file offset `start`."""
+        fd = self._get_fd()
+        if self._mmap is not None:
+            # Pages already in the page cache are copied without a syscall
+            return self._mmap[start:start + length]
+        if hasattr(os, 'pread'):
+            # Positional read: one syscall, no shared file position or buffer
+            return os.pread(fd, length, start)
+        os.lseek(fd, start, os.SEEK_SET)
+        return os.read(fd, length)
+    
+    def _iter_frame_lines(self, frame_numbers: List[int]) -> Iterator[Tuple[int, bytes]]:
+        """
+        Yield (frame, raw line) for the given frames straight from the file.
+        
+        The lines of all requested frames are sorted by byte offset and merged
+        into runs whose gaps are at most BATCH_READ_MAX_GAP bytes; each run is
+        fetched with a single read and its lines are sliced out in memory.
+        """
+        offsets = self._line_offsets
+        lengths = self._line_lengths
+        spans = sorted(
+            (offsets[i], lengths[i], frame)
+            for frame in set(frame_numbers)
+            for i in range(*self.frame_index.get(frame, (0, 0)))
         )
+        
+        i = 0
+        while i < len(spans):
+            run_start = spans[i][0]
+            run_end = run_start + spans[i][1]
+            j = i + 1
+            while j < len(spans) and spans[j][0] - run_end <= BATCH_READ_MAX_GAP:
+                run_end = max(run_end, spans[j][0] + spans[j][1])
+                j += 1
+            
+            buffer = self._read_span(run_start, run_end - run_start)
+            for byte_offset, line_length, frame in spans[i:j]:
+                start = byte_offset - run_start
+                yield frame, buffer[start:start + line_length]
+            i = j
+    
+    def _read_frames(self, frame_numbers: List[int]) -> Dict[int, MOTFrameData]:
+        """Read and parse frames straight from the file, bypassing both caches."""
+        rows: Dict[int, 'array[float]'] = {frame: array('d') for frame in frame_numbers}
+        parse = _parse_detection_bytes
+        for frame, line in self._iter_frame_lines(frame_numbers):
+            try:
+                rows[frame].extend(parse(line))
+            except (ValueError, IndexError):
+                continue
+        
+        return {frame: MOTFrameData(frame_number=frame, data=data)
+                for frame, data in rows.items()}
+    
+    def _read_raw_frames(self, frame_numbers: List[int]) -> Dict[int, bytes]:
+        """Read frames' lines straight from the file without parsing them."""
+        lines: Dict[int, List[bytes]] = {frame: [] for frame in frame_numbers}
+        for frame, line in self._iter_frame_lines(frame_numbers):
+            lines[frame].append(line)
+        return {frame: b'\n'.join(frame_lines) for frame, frame_lines in lines.items()}
+    
+    @staticmethod
+    def _parse_raw_frame(frame_number: int, raw: bytes) -> MOTFrameData:
+        """Parse a frame's raw lines, as stored in the raw cache."""
+        data: 'array[float]' = array('d')
+        parse = _parse_detection_bytes
+        for line in raw.split(b'\n'):
+            try:
+                data.extend(parse(line))
+            except (ValueError, IndexError):
+                continue
+        return MOTFrameData(frame_number=frame_number, data=data)
     
     def _load_frame_data_direct(self, frame_number: int) -> MOTFrameData:
         """Load frame data using direct file seeking (optimized I/O)."""
         start_time = time.time()
         
         # Get byte positions for this frame
-        positions = self.frame_index.get(frame_number, [])
-        if not positions:
-            return MOTFrameData(frame_number=frame_number, detections=[])
-        
-        # Use file seeking for direct access
-        file_handle = self._get_file_handle()
-        detections = []
+        if frame_number not in self.frame_index:
+            return MOTFrameData(frame_number=frame_number)
         
-        for byte_offset, line_length in positions:
-            file_handle.seek(byte_offset)
-            line = file_handle.read(line_length).strip()
-            
-            if line:
-                try:
-                    detection = self._parse_detection_line_fast(line)
-                    detections.append(detection)
-                except (ValueError, IndexError):
-                    continue
+        frame_data = self._read_frames([frame_number])[frame_number]
         
         load_time = time.time() - start_time
         self._update_statistics('direct_load_time', load_time)
         
-        return MOTFrameData(frame_number=frame_number, detections=detections)
+        return frame_data
     
     def _update_cache(self, frame_number: int, frame_data: MOTFrameData) -> None:
         """Update LRU cache with new frame data."""
-        # Remove if already exists (to update position)
-        if frame_number in self.frame_cache:
-            del self.frame_cache[frame_number]
+        frame_cache = self.frame_cache
         
-        # Add to end (most recently used)
-        self.frame_cache[frame_number] = frame_data
+        # Add or refresh at the end (most recently used)
+        if frame_number in frame_cache:
+            frame_cache.move_to_end(frame_number)
+        frame_cache[frame_number] = frame_data
         
-        # Evict oldest if cache is full
-        while len(self.frame_cache) > self.cache_size:
-            self.frame_cache.popitem(last=False)  # Remove oldest
+        # Evict oldest if cache is full; at most one entry was added. Evicted
+        # frames are dropped, not recycled: callers (e.g. the prefetching cache)
+        # may still hold them, and each frame is a single array, not per-row objects
+        if len(frame_cache) > self.cache_size:
+            frame_cache.popitem(last=False)  # Remove oldest
     
     def _update_statistics(self, key: str, value: float) -> None:
         """Update running statistics."""
@@ -160,15 +321,29 @@ class MOTDataProvider(DataProvider):
         start_time = time.time()
         
         # Check cache first
-        if frame_number in self.frame_cache:
+        try:
+            frame_data = self.frame_cache[frame_number]
+        except KeyError:
+            pass
+        else:
             # Move to end (mark as recently used)
-            frame_data = self.frame_cache.pop(frame_number)
-            self.frame_cache[frame_number] = frame_data
+            self.frame_cache.move_to_end(frame_number)
             
             self._update_statistics('cache_hit_time', time.time() - start_time)
             self.statistics['cache_hits'] = self.statistics.get('cache_hits', 0) + 1
             return frame_data
         
+        # Prefetched but not yet parsed - parse from memory, no file access
+        raw = self.raw_cache.pop(frame_number, None)
+        if raw is not None:
+            frame_data = self._parse_raw_frame(frame_number, raw)
+            self._update_cache(frame_number, frame_data)
+            
+            self._update_statistics('cache_hit_time', time.time() - start_time)
+            self.statistics['cache_hits'] = self.statistics.get('cache_hits', 0) + 1
+            self.statistics['raw_cache_hits'] = self.statistics.get('raw_cache_hits', 0) + 1
+            return frame_data
+        
         # Cache miss - load from file
         frame_data = self._load_frame_data_direct(frame_number)
         self._update_cache(frame_number, frame_data)
@@ -191,20 +366,57 @@ class MOTDataProvider(DataProvider):
                 cached_frames[frame_num] = self.frame_cache[frame_num]
                 # Update cache position
                 self.frame_cache.move_to_end(frame_num)
+            elif frame_num in self.raw_cache:
+                frame_data = self._parse_raw_frame(frame_num, self.raw_cache.pop(frame_num))
+                self._update_cache(frame_num, frame_data)
+                cached_frames[frame_num] = frame_data
             else:
                 uncached_frames.append(frame_num)
         
-        # Load uncached frames individually (simplified batch loading)
-        for frame_num in uncached_frames:
-            frame_data = self._load_frame_data_direct(frame_num)
-            self._update_cache(frame_num, frame_data)
-            cached_frames[frame_num] = frame_data
+        # Read all uncached frames together, with one read per contiguous file region
+        if uncached_frames:
+            for frame_num, frame_data in self._read_frames(uncached_frames).items():
+                self._update_cache(frame_num, frame_data)
+                cached_frames[frame_num] = frame_data
         
         total_time = time.time() - start_time
         self._update_statistics('batch_total_time', total_time)
         
         return cached_frames
     
+    def prefetch(self, frame_numbers: List[int]) -> None:
+        """
+        Read frames into the raw cache without parsing them.
+        
+        Parsing is deferred to the first load of each frame, so frames that are
+        prefetched but never loaded cost only the read. Frames that are already
+        cached, or not in the file, are skipped.
+        """
+        raw_cache = self.raw_cache
+        wanted = [
+            frame for frame in frame_numbers
+            if frame in self.frame_index and frame not in self.frame_cache and frame not in raw_cache
+        ]
+        if not wanted:
+            return
+        
+        for frame_num, raw in self._read_raw_frames(wanted).items():
+            raw_cache[frame_num] = raw
+        while len(raw_cache) > self.cache_size:
+            raw_cache.popitem(last=False)  # Remove oldest
+    
+    def hint(self, frame_number: int) -> None:
+        """Ask the OS to start reading a frame's lines into the page cache (POSIX only)."""
+        rows = self.frame_index.get(frame_number)
+        if rows is None or not hasattr(os, 'posix_fadvise'):
+            return
+        
+        # A frame's lines are in file order; hint the span covering all of them
+        first, last = rows[0], rows[1] - 1
+        start = self._line_offsets[first]
+        end = self._line_offsets[last] + self._line_lengths[last]
+        os.posix_fadvise(self._get_fd(), start, end - start, os.POSIX_FADV_WILLNEED)
+    
     def get_total_frames(self) -> int:
         """Get total number of frames."""
         return len(self.frame_index)
@@ -215,17 +427,18 @@ class MOTDataProvider(DataProvider):
     
     def get_stats(self) -> Dict[str, Any]:
         """Get comprehensive statistics."""
-        total_lines = sum(len(positions) for positions in self.frame_index.values())
         cache_hits = self.statistics.get('cache_hits', 0)
         cache_misses = self.statistics.get('cache_misses', 0)
         total_requests = cache_hits + cache_misses
         
         stats = {
             'total_frames': len(self.frame_index),
-            'total_indexed_lines': total_lines,
-            'index_memory_bytes': sys.getsizeof(self.frame_index),
+            'total_indexed_lines': int(self.statistics['total_indexed_lines']),
+            'index_memory_bytes': int(self.statistics['index_memory_bytes']),
             'cache_size': len(self.frame_cache),
             'cache_max_size': self.cache_size,
+            'raw_cache_size': len(self.raw_cache),
+            'raw_cache_hits': self.statistics.get('raw_cache_hits', 0),
             'cache_hits': cache_hits,
             'cache_misses': cache_misses,
             'cache_hit_rate': cache_hits / total_requests if total_requests > 0 else 0.0,
@@ -237,14 +450,25 @@ class MOTDataProvider(DataProvider):
         return stats
     
     def clear_cache(self) -> None:
-        """Clear the frame cache."""
+        """Clear the frame and raw caches."""
         self.frame_cache.clear()
+        self.raw_cache.clear()
     
     def close(self) -> None:
-        """Close file handle and clean up resources."""
-        if self._file_handle and not self._file_handle.closed:
-            self._file_handle.close()
-        self.frame_cache.clear()
+        """Close file descriptor and clean up resources."""
+        # getattr: also called from __del__ on instances whose __init__ did not finish
+        mapped = getattr(self, '_mmap', None)
+        if mapped is not None:
+            self._mmap = None
+            mapped.close()
+        fd = getattr(self, '_fd', None)
+        if fd is not None:
+            self._fd = None
+            os.close(fd)
+        if hasattr(self, 'frame_cache'):
+            self.frame_cache.clear()
+        if hasattr(self, 'raw_cache'):
+            self.raw_cache.clear()
     
     def __del__(self) -> None:
         """Cleanup on destruction."""
@@ -5,9 +5,12 @@ This module contains all protocols, dataclasses, and type definitions
 used throughout the codebase to reduce file count and improve organization.
 """
 
+import random
+import sys
 import time
+from array import array
 from dataclasses import dataclass
-from typing import Any, Protocol, Sequence, Dict, List, Set, Mapping, Tuple
+from typing import Any, Protocol, Sequence, Dict, Iterator, List, Optional, Set, Mapping, Tuple, Union, overload
 
 
 # =============================================================================
@@ -21,6 +24,24 @@ class DataProvider(Protocol):
         """Load data for given key. May perform blocking I/O."""
         ...
 
+    def load_batch(self, keys: List[int]) -> Dict[int, Any]:
+        """
+        Load several keys at once, returning {key: data}.
+        
+        The cache prefetches queued keys through this. The default loads each
+        key with `load`; override it when keys can be read together more cheaply.
+        """
+        return {key: self.load(key) for key in keys}
+
+    def hint(self, key: int) -> None:
+        """
+        Optional, non-blocking notice that `key` will probably be loaded soon.
+        
+        The cache calls this as soon as a key is queued for prefetching, before
+        `load` or `load_batch` is called for it. The default does nothing.
+        """
+        return None
+
     def get_available_frames(self) -> Set[int]:
         """Get set of available frame numbers."""
         ...
@@ -42,6 +63,20 @@ class AccessPredictor(Protocol):
         ...
 
 
+class ArrayAccessPredictor(AccessPredictor, Protocol):
+    """
+    Access predictor that can also return its scores as parallel sequences.
+    
+    Optional: the cache uses `get_likelihoods_arr` when a predictor provides it,
+    which lets predictors that build scores from fixed templates skip creating
+    a dict on every access.
+    """
+    
+    def get_likelihoods_arr(self, current: int, history: Sequence[int]) -> Tuple[Sequence[int], Sequence[float]]:
+        """Return (keys, scores) of equal length; the same data as `get_likelihoods`."""
+        ...
+
+
 class EvictionPolicy(Protocol):
     """Protocol for choosing which cache entries to evict."""
     
@@ -52,6 +87,20 @@ class EvictionPolicy(Protocol):
         ...
 
 
+class RankedEvictionPolicy(EvictionPolicy, Protocol):
+    """
+    Eviction policy whose choice is the entry with the lowest fixed rank.
+    
+    Optional: when a policy provides `eviction_rank`, the cache ranks each
+    candidate once and keeps the candidates in a heap, instead of calling
+    `pick_victim` over all of them for every eviction.
+    """
+    
+    def eviction_rank(self, entry: "CacheEntry") -> float:
+        """Rank of an entry; `pick_victim` must pick the lowest-ranked key."""
+        ...
+
+
 class EventCallback(Protocol):
     """
     Protocol for cache event callbacks.
@@ -112,15 +161,22 @@ class EventCallback(Protocol):
 # Cache Data Structures
 # =============================================================================
 
+# Bound once; CacheEntry reads it whenever it has to stamp itself. Returns an
+# int, so no float is allocated per entry; timestamps only order entries
+_monotonic_ns = time.monotonic_ns
+
+
 @dataclass
 class CacheEntry:
-    """Cache entry with data and metadata."""
+    """Cache entry with data and metadata (timestamp in monotonic nanoseconds)."""
+    __slots__ = ('data', 'timestamp')
+    
     data: Any
-    timestamp: float
+    timestamp: int
     
     def __post_init__(self) -> None:
         if self.timestamp == 0:
-            self.timestamp = time.time()
+            self.timestamp = _monotonic_ns()
 
 
 @dataclass
@@ -134,7 +190,14 @@ class CacheMetrics:
 
 @dataclass
 class PrefetchTask:
-    """Priority queue entry for prefetch scheduling."""
+    """
+    Priority queue entry for prefetch scheduling.
+    
+    The cache itself queues plain (key, score) tuples in priority order rather
+    than task objects; this class is kept for callers that schedule with a heap.
+    """
+    __slots__ = ('priority', 'key')
+    
     priority: float  # negative likelihood for min-heap
     key: int
     
@@ -160,11 +223,116 @@ class MOTDetection:
     visibility_ratio: float
 
 
-@dataclass
+# Column order of one detection row in MOTFrameData.data
+MOT_DETECTION_FIELDS = (
+    'frame', 'track_id', 'bb_left', 'bb_top', 'bb_width', 'bb_height',
+    'confidence', 'class_id', 'visibility_ratio'
+)
+_MOT_ROW_SIZE = len(MOT_DETECTION_FIELDS)
+
+
+@dataclass(init=False)
 class MOTFrameData:
-    """All detections for a single frame."""
+    """
+    All detections for a single frame.
+    
+    Detections are stored as rows of one flat float array (row-major, one
+    value per MOT_DETECTION_FIELDS column) instead of one object per detection.
+    MOTDetection objects are only built when `detections` or indexing asks for them.
+    
+    Construct with `data` (the flat rows) or, as before the flat layout, with a
+    `detections` sequence of MOTDetection objects, which is packed into rows.
+    """
     frame_number: int
-    detections: List[MOTDetection]
+    data: 'array[float]'
+    
+    def __init__(self, frame_number: int, data: Optional['array[float]'] = None,
+                 detections: Optional[Sequence[MOTDetection]] = None) -> None:
+        if detections is not None:
+            if data is not None:
+                raise TypeError("MOTFrameData takes either data or detections, not both")
+            data = _pack_detections(detections)
+        self.frame_number = frame_number
+        self.data = array('d') if data is None else data
+    
+    @classmethod
+    def from_detections(cls, frame_number: int,
+                        detections: Sequence[MOTDetection]) -> 'MOTFrameData':
+        """Pack MOTDetection objects into the flat row layout."""
+        return cls(frame_number=frame_number, data=_pack_detections(detections))
+    
+    @property
+    def num_detections(self) -> int:
+        return len(self.data) // _MOT_ROW_SIZE
+    
+    def __getitem__(self, index: int) -> MOTDetection:
+        count = self.num_detections
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("detection index out of range")
+        start = index * _MOT_ROW_SIZE
+        return _detection_from_row(self.data[start:start + _MOT_ROW_SIZE])
+    
+    @property
+    def detections(self) -> Sequence[MOTDetection]:
+        """Read-only view of the detections; each MOTDetection is built when accessed."""
+        return _DetectionView(self)
+    
+    def rows(self) -> Iterator[Tuple[float, ...]]:
+        """Iterate over detections as plain tuples of MOT_DETECTION_FIELDS values."""
+        return zip(*[iter(self.data)] * _MOT_ROW_SIZE)
+    
+    def column(self, name: str) -> 'array[float]':
+        """Values of one MOT_DETECTION_FIELDS column across all detections."""
+        return self.data[MOT_DETECTION_FIELDS.index(name)::_MOT_ROW_SIZE]
+
+
+def _pack_detections(detections: Sequence[MOTDetection]) -> 'array[float]':
+    data = array('d')
+    for det in detections:
+        data.extend((det.frame, det.track_id, det.bb_left, det.bb_top, det.bb_width,
+                     det.bb_height, det.confidence, det.class_id, det.visibility_ratio))
+    return data
+
+
+def _detection_from_row(row: Sequence[float]) -> MOTDetection:
+    return MOTDetection(int(row[0]), int(row[1]), row[2], row[3], row[4],
+                        row[5], row[6], int(row[7]), row[8])
+
+
+class _DetectionView(Sequence[MOTDetection]):
+    """Sequence of a frame's detections that builds MOTDetection objects on demand."""
+    
+    __slots__ = ('_frame',)
+    
+    def __init__(self, frame: MOTFrameData) -> None:
+        self._frame = frame
+    
+    def __len__(self) -> int:
+        return self._frame.num_detections
+    
+    @overload
+    def __getitem__(self, index: int) -> MOTDetection: ...
+    
+    @overload
+    def __getitem__(self, index: slice) -> List[MOTDetection]: ...
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[MOTDetection, List[MOTDetection]]:
+        if isinstance(index, slice):
+            return [self._frame[i] for i in range(len(self))[index]]
+        return self._frame[index]
+    
+    def __iter__(self) -> Iterator[MOTDetection]:
+        return map(_detection_from_row, self._frame.rows())
+    
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+    
+    def __repr__(self) -> str:
+        return repr(list(self))
 
 
 # =============================================================================
@@ -185,9 +353,11 @@ class EvictionPolicyLargest:
     
     def pick_victim(self, cache_contents: Mapping[int, CacheEntry],
                    scores: Mapping[int, float]) -> int:
-        import sys
-        return max(cache_contents.keys(),
-                  key=lambda k: sys.getsizeof(cache_contents[k].data))
+        return min(cache_contents.keys(),
+                  key=lambda k: self.eviction_rank(cache_contents[k]))
+    
+    def eviction_rank(self, entry: CacheEntry) -> float:
+        return -sys.getsizeof(entry.data)
 
 
 class EvictionPolicySmallest:
@@ -195,9 +365,27 @@ class EvictionPolicySmallest:
     
     def pick_victim(self, cache_contents: Mapping[int, CacheEntry],
                    scores: Mapping[int, float]) -> int:
-        import sys
         return min(cache_contents.keys(),
-                  key=lambda k: sys.getsizeof(cache_contents[k].data))
+                  key=lambda k: self.eviction_rank(cache_contents[k]))
+    
+    def eviction_rank(self, entry: CacheEntry) -> float:
+        return sys.getsizeof(entry.data)
+
+
+class EvictionPolicyTwoRandom:
+    """
+    Evict the older of two randomly sampled entries (approximates oldest).
+    
+    Only two timestamps are compared, but sampling still copies the keys, so
+    picking a victim is O(n) in the number of candidates, as for the others.
+    """
+    
+    def pick_victim(self, cache_contents: Mapping[int, CacheEntry],
+                   scores: Mapping[int, float]) -> int:
+        if len(cache_contents) < 2:
+            return next(iter(cache_contents))
+        a, b = random.sample(list(cache_contents.keys()), 2)
+        return a if cache_contents[a].timestamp <= cache_contents[b].timestamp else b
 
 
 # =============================================================================
@@ -207,5 +395,5 @@ class EvictionPolicySmallest:
 # Common type aliases for better readability
 CacheContents = Dict[int, CacheEntry]
 LikelihoodScores = Dict[int, float]
-FrameIndex = Dict[int, List[Tuple[int, int]]]  # frame -> [(byte_offset, line_length)]
+FrameIndex = Dict[int, Tuple[int, int]]  # frame -> (first, end) rows of its line offsets/lengths
 Statistics = Dict[str, Any]
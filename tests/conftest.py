@@ -1,10 +1,9 @@
 """Shared pytest fixtures and configuration for dynamic_prefetching_cache tests."""
 
+import itertools
 import pytest
-import tempfile
-import os
 from pathlib import Path
-from typing import Any, Dict, List, Set, Optional, Iterator, Tuple
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 
 from dynamic_prefetching_cache.types import DataProvider, AccessPredictor, MOTDetection, MOTFrameData
 
@@ -15,6 +14,18 @@ class MockDataProvider(DataProvider):
     def __init__(self, data: Optional[Dict[int, Any]] = None) -> None:
         self.data = data or {i: f"data_{i}" for i in range(10)}
         self.load_calls: List[int] = []
+        self.batch_calls: List[List[int]] = []
+        self.hint_calls: List[int] = []
+    
+    @property
+    def data(self) -> Dict[int, Any]:
+        return self._data
+    
+    @data.setter
+    def data(self, value: Dict[int, Any]) -> None:
+        # Frame set is built once per assignment; the cache asks for it repeatedly
+        self._data = value
+        self._available_frames: FrozenSet[int] = frozenset(value)
         
     def load(self, key: int) -> Any:
         self.load_calls.append(key)
@@ -22,8 +33,15 @@ class MockDataProvider(DataProvider):
             raise KeyError(f"Key {key} not found")
         return self.data[key]
     
-    def get_available_frames(self) -> Set[int]:
-        return set(self.data.keys())
+    def load_batch(self, keys: List[int]) -> Dict[int, Any]:
+        self.batch_calls.append(list(keys))
+        return super().load_batch(keys)
+    
+    def hint(self, key: int) -> None:
+        self.hint_calls.append(key)
+    
+    def get_available_frames(self) -> FrozenSet[int]:
+        return self._available_frames
     
     def get_total_frames(self) -> int:
         return len(self.data)
@@ -38,13 +56,21 @@ class MockDataProvider(DataProvider):
 class MockAccessPredictor(AccessPredictor):
     """Simple mock access predictor for testing."""
     
-    def __init__(self, predictions: Optional[Dict[int, Dict[int, float]]] = None) -> None:
+    def __init__(self,
+                 predictions: Optional[Dict[int, Dict[int, float]]] = None,
+                 record_history: bool = False) -> None:
         self.predictions = predictions or {}
-        self.call_history: List[Tuple[int, List[int]]] = []
+        # Off by default so long-running tests don't keep a copy of every history
+        self.record_history = record_history
+        self.call_history: List[Tuple[int, Tuple[int, ...]]] = []
         
     def get_likelihoods(self, current: int, history: List[int]) -> Dict[int, float]:
-        self.call_history.append((current, list(history)))
+        if self.record_history:
+            self.call_history.append((current, tuple(history)))
         return self.predictions.get(current, {current + 1: 0.8, current + 2: 0.4})
+    
+    def clear_history(self) -> None:
+        self.call_history.clear()
 
 
 @pytest.fixture
@@ -59,7 +85,7 @@ def mock_predictor() -> MockAccessPredictor:
     return MockAccessPredictor()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_mot_data() -> List[str]:
     """Fixture providing sample MOT data for testing."""
     return [
@@ -71,19 +97,28 @@ def sample_mot_data() -> List[str]:
     ]
 
 
-@pytest.fixture
-def temp_mot_file(sample_mot_data: List[str]) -> Iterator[str]:
-    """Fixture providing a temporary MOT data file."""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-        for line in sample_mot_data:
-            f.write(line + '\n')
-        temp_path = f.name
+@pytest.fixture(scope="session")
+def write_mot_file(tmp_path_factory: pytest.TempPathFactory) -> Callable[[List[str]], str]:
+    """
+    Fixture providing a function that writes MOT lines to a new file and returns its path.
+    
+    Files go to one session temp directory that pytest cleans up itself.
+    """
+    directory = tmp_path_factory.mktemp("mot")
+    file_numbers = itertools.count()
     
-    yield temp_path
+    def write(lines: List[str]) -> str:
+        path = directory / f"data_{next(file_numbers)}.txt"
+        path.write_text("".join(line + "\n" for line in lines))
+        return str(path)
     
-    # Cleanup
-    if os.path.exists(temp_path):
-        os.unlink(temp_path)
+    return write
+
+
+@pytest.fixture(scope="session")
+def temp_mot_file(sample_mot_data: List[str], write_mot_file: Callable[[List[str]], str]) -> str:
+    """Fixture providing a temporary MOT data file (shared; tests only read it)."""
+    return write_mot_file(sample_mot_data)
 
 
 @pytest.fixture
@@ -96,20 +131,20 @@ def example_data_path() -> Path:
 def small_test_data() -> Dict[int, MOTFrameData]:
     """Fixture providing small test dataset for unit tests."""
     return {
-        1: MOTFrameData(
+        1: MOTFrameData.from_detections(
             frame_number=1,
             detections=[
                 MOTDetection(1, 1, 100, 200, 50, 75, 0.9, 125, 237, 0)
             ]
         ),
-        2: MOTFrameData(
+        2: MOTFrameData.from_detections(
             frame_number=2,
             detections=[
                 MOTDetection(2, 1, 105, 205, 50, 75, 0.85, 130, 242, 0),
                 MOTDetection(2, 2, 205, 305, 60, 80, 0.75, 235, 345, 0)
             ]
         ),
-        3: MOTFrameData(
+        3: MOTFrameData.from_detections(
             frame_number=3,
             detections=[
                 MOTDetection(3, 1, 110, 210, 50, 75, 0.9, 135, 247, 0)
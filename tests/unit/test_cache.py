@@ -8,7 +8,7 @@ import queue
 from typing import Dict, Any, List
 
 from dynamic_prefetching_cache import DynamicPrefetchingCache
-from dynamic_prefetching_cache.types import EvictionPolicyOldest, EvictionPolicyLargest
+from dynamic_prefetching_cache.types import EvictionPolicyOldest, EvictionPolicyLargest, EvictionPolicySmallest, EvictionPolicyTwoRandom
 from tests.conftest import MockDataProvider, MockAccessPredictor
 
 
@@ -63,6 +63,7 @@ class TestDynamicPrefetchingCache:
     @pytest.mark.unit
     def test_prefetch_queue_rebuilds_on_position_jump(self, mock_provider: MockDataProvider, mock_predictor: MockAccessPredictor) -> None:
         """Test queue rebuilding when position jumps significantly."""
+        mock_predictor.record_history = True
         # Set up predictor with specific predictions
         mock_predictor.predictions = {
             1: {2: 0.9, 3: 0.7},
@@ -96,6 +97,7 @@ class TestDynamicPrefetchingCache:
     @pytest.mark.unit
     def test_prefetch_queue_incremental_sync_sequential(self, mock_provider: MockDataProvider, mock_predictor: MockAccessPredictor) -> None:
         """Test incremental sync for sequential access patterns."""
+        mock_predictor.record_history = True
         # Set up predictor for sequential access
         mock_predictor.predictions = {
             1: {2: 0.9, 3: 0.7, 4: 0.5},
@@ -121,6 +123,75 @@ class TestDynamicPrefetchingCache:
         finally:
             cache.close()
     
+    @pytest.mark.unit
+    def test_prefetch_uses_load_batch(self, mock_provider: MockDataProvider, mock_predictor: MockAccessPredictor) -> None:
+        """Test that several queued prefetch keys are loaded with one load_batch call."""
+        mock_predictor.predictions = {1: {2: 0.9, 3: 0.7, 4: 0.5}}
+        
+        cache = DynamicPrefetchingCache(mock_provider, mock_predictor, max_keys_cached=10, max_keys_prefetched=3)
+        
+        try:
+            cache.get(1)
+            time.sleep(0.1)
+            
+            assert [2, 3, 4] in mock_provider.batch_calls
+            # Queued keys were hinted to the provider before being loaded
+            assert mock_provider.hint_calls[:3] == [2, 3, 4]
+            assert {2, 3, 4} <= set(cache.cache)
+            assert cache.stats()['prefetch_errors'] == 0
+            
+        finally:
+            cache.close()
+    
+    @pytest.mark.unit
+    def test_inflight_prefetch_not_queued_again(self, mock_predictor: MockAccessPredictor) -> None:
+        """Test that a key still being prefetched is not queued again by a newer plan."""
+        class SlowProvider(MockDataProvider):
+            def load(self, key: int) -> Any:
+                if key == 2:
+                    time.sleep(0.2)
+                return super().load(key)
+        
+        provider = SlowProvider()
+        mock_predictor.predictions = {1: {2: 0.9}, 3: {2: 0.9}}
+        cache = DynamicPrefetchingCache(provider, mock_predictor, max_keys_cached=10)
+        
+        try:
+            cache.get(1)
+            time.sleep(0.05)  # Worker is now loading key 2
+            cache.get(3)
+            time.sleep(0.3)
+            
+            assert provider.load_calls.count(2) == 1
+            assert 2 in cache.cache
+            assert not cache._inflight
+            
+        finally:
+            cache.close()
+    
+    @pytest.mark.unit
+    def test_multiple_prefetch_workers(self, mock_provider: MockDataProvider, mock_predictor: MockAccessPredictor) -> None:
+        """Test that prefetch work is shared between several worker threads."""
+        mock_predictor.predictions = {1: {2: 0.9, 3: 0.8, 4: 0.7, 5: 0.6}}
+        
+        cache = DynamicPrefetchingCache(mock_provider, mock_predictor, max_keys_cached=10,
+                                        max_keys_prefetched=4, prefetch_workers=2)
+        
+        try:
+            assert len(cache.worker_threads) == 2
+            
+            cache.get(1)
+            time.sleep(0.1)
+            
+            assert {2, 3, 4, 5} <= set(cache.cache)
+            # Each worker claims at most its share of max_keys_prefetched
+            assert all(len(keys) <= 2 for keys in mock_provider.batch_calls)
+            
+        finally:
+            cache.close()
+        
+        assert not any(worker.is_alive() for worker in cache.worker_threads)
+    
     @pytest.mark.unit
     def test_cache_eviction_when_full(self, mock_provider: MockDataProvider, mock_predictor: MockAccessPredictor) -> None:
         """Test eviction behavior when cache exceeds max_keys_cached."""
@@ -183,6 +254,34 @@ class TestDynamicPrefetchingCache:
         finally:
             cache.close()
     
+    @pytest.mark.unit
+    def test_eviction_uses_priority_from_insert_or_access(self, mock_provider: MockDataProvider, mock_predictor: MockAccessPredictor) -> None:
+        """Test that victims are chosen by the score a key had when inserted or accessed."""
+        # Each key only scores itself, so nothing is prefetched
+        mock_predictor.predictions = {
+            1: {1: 0.9},
+            2: {2: 0.1},
+            3: {3: 0.5}
+        }
+        
+        cache = DynamicPrefetchingCache(mock_provider, mock_predictor, max_keys_cached=2)
+        
+        try:
+            cache.get(1)
+            cache.get(2)
+            cache.get(3)  # Key 2 has the lowest stored priority
+            
+            assert set(cache.cache) == {1, 3}
+            assert cache.stats()['evictions'] == 1
+            
+            # Repeated hits must not grow the eviction heap without bound
+            for _ in range(500):
+                cache.get(3)
+            assert len(cache._eviction_heap) <= 2 * len(cache.cache) + 64
+            
+        finally:
+            cache.close()
+    
     @pytest.mark.unit
     def test_worker_thread_processes_prefetch_tasks(self, mock_provider: MockDataProvider, mock_predictor: MockAccessPredictor) -> None:
         """Test that worker thread processes prefetch tasks correctly."""
@@ -207,6 +306,22 @@ class TestDynamicPrefetchingCache:
         finally:
             cache.close()
     
+    @pytest.mark.unit
+    def test_low_priority_worker(self, mock_provider: MockDataProvider, mock_predictor: MockAccessPredictor) -> None:
+        """Test that a low-priority worker is named for profiling and still prefetches."""
+        mock_predictor.predictions = {1: {2: 0.9}}
+        cache = DynamicPrefetchingCache(mock_provider, mock_predictor, max_keys_cached=10, low_priority_worker=True)
+        
+        try:
+            assert cache.worker_thread.name == 'dpc-prefetch'
+            
+            cache.get(1)
+            time.sleep(0.1)
+            assert 2 in cache.cache
+            
+        finally:
+            cache.close()
+    
     @pytest.mark.unit
     def test_clean_shutdown_and_resource_cleanup(self, mock_provider: MockDataProvider, mock_predictor: MockAccessPredictor) -> None:
         """Test clean shutdown via close() and context manager."""
@@ -314,6 +429,10 @@ class TestDynamicPrefetchingCache:
             for key, result in results.items():
                 assert result == f"data_{key}"
             
+            # Per-thread counters of the finished threads are still summed
+            stats = cache.stats()
+            assert stats['hits'] + stats['misses'] == 50
+            
         finally:
             cache.close()
     
@@ -347,6 +466,79 @@ class TestDynamicPrefetchingCache:
         finally:
             cache.close()
     
+    @pytest.mark.unit
+    def test_hit_ratio_ewma(self, mock_provider: MockDataProvider, mock_predictor: MockAccessPredictor) -> None:
+        """Test that the hit ratio gauge moves towards recent outcomes."""
+        cache = DynamicPrefetchingCache(mock_provider, mock_predictor, max_keys_cached=10)
+        
+        try:
+            assert cache.stats()['hit_ratio_ewma'] == 0.5
+            
+            cache.get(1)  # Miss
+            after_miss = cache.stats()['hit_ratio_ewma']
+            assert after_miss < 0.5
+            
+            for _ in range(500):
+                cache.get(1)  # Hits
+            assert after_miss < cache.stats()['hit_ratio_ewma'] <= 1.0
+            assert cache.stats()['hit_ratio_ewma'] > 0.99
+            
+            cache.reset_stats()
+            assert cache.stats()['hit_ratio_ewma'] == 0.5
+            
+        finally:
+            cache.close()
+    
+    @pytest.mark.unit
+    def test_reset_stats_keeps_cached_data(self, mock_provider: MockDataProvider, mock_predictor: MockAccessPredictor) -> None:
+        """Test that reset_stats clears counters but not cache contents."""
+        cache = DynamicPrefetchingCache(mock_provider, mock_predictor, max_keys_cached=10)
+        
+        try:
+            cache.get(1)  # Miss
+            cache.get(1)  # Hit
+            
+            cache.reset_stats()
+            
+            stats = cache.stats()
+            assert stats['hits'] == 0
+            assert stats['misses'] == 0
+            assert stats['evictions'] == 0
+            assert stats['prefetch_errors'] == 0
+            assert stats['cache_keys'] >= 1
+            
+            # Key 1 is still cached, so this is a hit in the new window
+            cache.get(1)
+            assert cache.stats()['hits'] == 1
+            
+        finally:
+            cache.close()
+    
+    @pytest.mark.unit
+    def test_exited_getter_threads_keep_their_counts(self, mock_provider: MockDataProvider, mock_predictor: MockAccessPredictor) -> None:
+        """Test that counters of exited getter threads are retired, not leaked."""
+        cache = DynamicPrefetchingCache(mock_provider, mock_predictor, max_keys_cached=10)
+        
+        try:
+            cache.get(1)  # Miss
+            
+            def getter() -> None:
+                cache.get(1)  # Hit
+            
+            for _ in range(20):
+                t = threading.Thread(target=getter)
+                t.start()
+                t.join()
+            
+            # Only the calling thread is still registered
+            assert len(cache._thread_counters) == 1
+            stats = cache.stats()
+            assert stats['hits'] == 20
+            assert stats['misses'] == 1
+            
+        finally:
+            cache.close()
+    
     @pytest.mark.unit
     def test_different_eviction_policies(self, mock_provider: MockDataProvider, mock_predictor: MockAccessPredictor) -> None:
         """Test that different eviction policies work correctly."""
@@ -387,6 +579,58 @@ class TestDynamicPrefetchingCache:
         finally:
             cache2.close()
     
+    @pytest.mark.unit
+    def test_two_random_eviction_policy(self, mock_provider: MockDataProvider, mock_predictor: MockAccessPredictor) -> None:
+        """Test that the 2-random eviction policy keeps the cache within its limit."""
+        cache = DynamicPrefetchingCache(
+            mock_provider, mock_predictor, 
+            max_keys_cached=2, 
+            eviction_policy=EvictionPolicyTwoRandom
+        )
+        
+        try:
+            cache.get(1)
+            cache.get(2)
+            cache.get(3)  # Should evict one of the tied entries
+            
+            stats = cache.stats()
+            assert stats['evictions'] >= 1
+            assert stats['cache_keys'] == 2
+            
+        finally:
+            cache.close()
+    
+    @pytest.mark.unit
+    @pytest.mark.parametrize("policy,expected_evicted", [
+        (EvictionPolicyLargest, [1, 5, 3]),
+        (EvictionPolicySmallest, [0, 2, 6]),
+    ])
+    def test_policy_breaks_ties_across_evictions(self, mock_predictor: MockAccessPredictor,
+                                                 policy: Any, expected_evicted: List[int]) -> None:
+        """Test that a tie-breaking policy keeps choosing correctly from a long-lived group of ties."""
+        sizes = [5, 40, 10, 30, 20, 50, 1]
+        provider = MockDataProvider({i: "x" * size for i, size in enumerate(sizes)})
+        mock_predictor.predictions = {i: {} for i in range(len(sizes))}  # All priorities tie
+        evicted: List[int] = []
+        
+        cache = DynamicPrefetchingCache(
+            provider, mock_predictor,
+            max_keys_cached=4,
+            eviction_policy=policy,
+            on_event=lambda name, **kwargs: evicted.append(kwargs['key']) if name == 'cache_evict' else None
+        )
+        
+        try:
+            for key in range(len(sizes)):
+                cache.get(key)
+            
+            # Each eviction takes the largest/smallest entry among everything cached at the time
+            assert evicted == expected_evicted
+            assert set(cache.cache) == set(range(len(sizes))) - set(expected_evicted)
+            
+        finally:
+            cache.close()
+    
     @pytest.mark.unit
     def test_event_callback_functionality(self, mock_provider: MockDataProvider, mock_predictor: MockAccessPredictor) -> None:
         """Test that event callbacks are called correctly."""
@@ -420,6 +664,7 @@ class TestDynamicPrefetchingCache:
     @pytest.mark.unit
     def test_history_tracking(self, mock_provider: MockDataProvider, mock_predictor: MockAccessPredictor) -> None:
         """Test that access history is tracked correctly."""
+        mock_predictor.record_history = True
         cache = DynamicPrefetchingCache(mock_provider, mock_predictor, max_keys_cached=10, history_size=5)
         
         try:
@@ -431,9 +676,19 @@ class TestDynamicPrefetchingCache:
             # Give time for predictor calls
             time.sleep(0.1)
             
-            # Check that predictor received history
+            # The ring buffer unrolls to the most recent keys, oldest first
+            assert cache.history == (2, 3, 4, 5, 6)
+            
+            # Keys the history cannot store are rejected without moving the position
+            with pytest.raises(ValueError):
+                cache.get(2 ** 70)
+            assert cache.current_key == 6
+            assert cache.history == (2, 3, 4, 5, 6)
+            
+            # Check that predictor received history; rapid position changes
+            # are coalesced into at most one call each
             calls = mock_predictor.call_history
-            assert len(calls) >= len(sequence)
+            assert 1 <= len(calls) <= len(sequence)
             
             # Last call should have history limited to history_size
             last_call = calls[-1]
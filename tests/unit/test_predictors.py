@@ -51,6 +51,29 @@ class TestDynamicDistanceDecayPredictor:
 class TestDynamicDataPredictor:
     """Test suite for DynamicDataPredictor."""
     
+    def test_shifted_template_matches_direct_scores(self):
+        """Test that interior positions served from the offset template equal a full rebuild."""
+        predictor = DynamicDataPredictor(possible_jumps=[-15, -1, 1, 15], length=500)
+        
+        for current in (40, 41, 250):
+            for history in ([], [current - 2, current - 1, current]):
+                streak = len(history) == 3
+                keys, scores = predictor._scores_at(current, streak)
+                assert predictor.get_likelihoods(current, history) == dict(zip(keys, scores))
+    
+    def test_parameters_are_read_only(self):
+        """Test that the precomputed parameters cannot be changed after construction."""
+        jumps = [-5, 5]
+        predictor = DynamicDataPredictor(possible_jumps=jumps, jump_boost=4.0)
+        jumps.append(30)  # The caller's list is copied
+        
+        assert predictor.possible_jumps == (-5, 5)
+        assert predictor.jump_boost == 4.0
+        with pytest.raises(AttributeError):
+            predictor.jump_boost = 1.0
+        with pytest.raises(AttributeError):
+            predictor.length = 100
+    
     def test_basic_contract_compliance(self):
         """Test that predictor returns correct type and positive values."""
         predictor = DynamicDataPredictor(possible_jumps=[5, 10, -5])
@@ -198,4 +221,20 @@ class TestDynamicDataPredictor:
         # Test with zero proximity_range
         predictor = DynamicDataPredictor(possible_jumps=[5], proximity_range=0)
         result = predictor.get_likelihoods(current=0, history=[])
-        assert len(result) > 0
\ No newline at end of file
+        assert len(result) > 0
+
+class TestArrayInterface:
+    """Test suite for the optional get_likelihoods_arr interface."""
+    
+    @pytest.mark.parametrize("predictor", [
+        DistanceDecayPredictor(max_span=10),
+        DynamicDistanceDecayPredictor(max_span=10),
+        DynamicDataPredictor(possible_jumps=[-5, 1, 5], max_span=10, length=60),
+    ])
+    @pytest.mark.parametrize("current,history", [(0, []), (3, [1, 2]), (50, [52, 50]), (50, [48, 49]), (20, [17, 18, 19])])
+    def test_matches_get_likelihoods(self, predictor, current, history):
+        """Test that the parallel sequences carry the same scores as the dict form."""
+        keys, scores = predictor.get_likelihoods_arr(current, history)
+        
+        assert len(keys) == len(scores)
+        assert dict(zip(keys, scores)) == predictor.get_likelihoods(current, history)
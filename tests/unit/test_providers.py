@@ -1,10 +1,8 @@
 """Unit tests for data providers."""
 
 import pytest
-import tempfile
 import os
-from pathlib import Path
-from typing import List, Dict
+from typing import Callable, List, Dict
 
 from dynamic_prefetching_cache.providers import MOTDataProvider
 
@@ -58,6 +56,60 @@ class TestMOTDataProvider:
         assert batch_data[3].frame_number == 3
         assert len(batch_data[3].detections) == 1
     
+    def test_load_batch_reads_adjacent_frames_once(self, temp_mot_file: str) -> None:
+        """Test that batch loading fetches nearby frames with a single read."""
+        provider = MOTDataProvider(temp_mot_file, cache_size=10)
+        reads: List[int] = []
+        read_span = provider._read_span
+        
+        def counting_read_span(start: int, length: int) -> bytes:
+            reads.append(start)
+            return read_span(start, length)
+        
+        provider._read_span = counting_read_span  # type: ignore[method-assign]
+        
+        batch_data = provider.load_batch([3, 1, 2])
+        
+        assert reads == [0]
+        assert [d.track_id for d in batch_data[2].detections] == [1, 2]
+        assert batch_data[3].detections == provider.load(3).detections
+        provider.close()
+    
+    def test_hint_does_not_load(self, temp_mot_file: str) -> None:
+        """Test that hinting frames is a no-op for the provider's own cache."""
+        provider = MOTDataProvider(temp_mot_file, cache_size=10)
+        
+        provider.hint(1)
+        provider.hint(999)  # Unknown frames are ignored
+        
+        assert len(provider.frame_cache) == 0
+        assert len(provider.load(1).detections) == 2
+        provider.close()
+    
+    def test_prefetch_defers_parsing(self, temp_mot_file: str) -> None:
+        """Test that prefetched frames are kept raw and parsed on first load."""
+        provider = MOTDataProvider(temp_mot_file, cache_size=10)
+        expected = provider._read_frames([2])[2]
+        
+        provider.prefetch([2, 3, 999])  # Unknown frames are skipped
+        
+        assert list(provider.raw_cache) == [2, 3]
+        assert len(provider.frame_cache) == 0
+        
+        frame_data = provider.load(2)
+        assert frame_data.data == expected.data
+        assert 2 not in provider.raw_cache
+        assert 2 in provider.frame_cache
+        
+        stats = provider.get_stats()
+        assert stats['raw_cache_hits'] == 1
+        assert stats['raw_cache_size'] == 1
+        assert stats['cache_misses'] == 0
+        
+        assert provider.load_batch([3])[3].frame_number == 3
+        assert len(provider.raw_cache) == 0
+        provider.close()
+    
     def test_parse_invalid_line_formats(self) -> None:
         """Test parsing various invalid line formats."""
         provider = MOTDataProvider.__new__(MOTDataProvider)  # Create without __init__
@@ -74,26 +126,21 @@ class TestMOTDataProvider:
         with pytest.raises(ValueError):
             provider._parse_detection_line_fast("")
     
-    def test_empty_file_handling(self) -> None:
+    def test_empty_file_handling(self, write_mot_file: Callable[[List[str]], str]) -> None:
         """Test handling of empty files."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            temp_path = f.name
-        
-        try:
-            provider = MOTDataProvider(temp_path, cache_size=10)
-            
-            assert provider.get_total_frames() == 0
-            assert len(provider.get_available_frames()) == 0
-            
-            # Loading from empty file should return empty frame
-            frame_data = provider.load(1)
-            assert frame_data.frame_number == 1
-            assert len(frame_data.detections) == 0
-            
-        finally:
-            os.unlink(temp_path)
+        temp_path = write_mot_file([])
+        
+        provider = MOTDataProvider(temp_path, cache_size=10)
+        
+        assert provider.get_total_frames() == 0
+        assert len(provider.get_available_frames()) == 0
+        
+        # Loading from empty file should return empty frame
+        frame_data = provider.load(1)
+        assert frame_data.frame_number == 1
+        assert len(frame_data.detections) == 0
     
-    def test_file_with_only_invalid_lines(self) -> None:
+    def test_file_with_only_invalid_lines(self, write_mot_file: Callable[[List[str]], str]) -> None:
         """Test file containing only invalid/malformed lines."""
         invalid_lines = [
             "invalid,line",
@@ -102,52 +149,38 @@ class TestMOTDataProvider:
             "   ",  # Whitespace only
         ]
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            for line in invalid_lines:
-                f.write(line + '\n')
-            temp_path = f.name
-        
-        try:
-            provider = MOTDataProvider(temp_path, cache_size=10)
-            
-            # Should handle gracefully - no frames indexed
-            assert provider.get_total_frames() == 0
-            assert len(provider.get_available_frames()) == 0
-            
-        finally:
-            os.unlink(temp_path)
+        temp_path = write_mot_file(invalid_lines)
+        
+        provider = MOTDataProvider(temp_path, cache_size=10)
+        
+        # Should handle gracefully - no frames indexed
+        assert provider.get_total_frames() == 0
+        assert len(provider.get_available_frames()) == 0
     
-    def test_file_with_valid_frame_invalid_detection_data(self) -> None:
+    def test_file_with_valid_frame_invalid_detection_data(self, write_mot_file: Callable[[List[str]], str]) -> None:
         """Test file with valid frame numbers but invalid detection data."""
         lines_with_valid_frames_invalid_data = [
             "1,2,3",  # Valid frame number but too few fields for detection
             "2,abc,def,ghi,jkl,mno,pqr",  # Valid frame number but non-numeric detection data
         ]
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            for line in lines_with_valid_frames_invalid_data:
-                f.write(line + '\n')
-            temp_path = f.name
-        
-        try:
-            provider = MOTDataProvider(temp_path, cache_size=10)
-            
-            # Frames should be indexed (valid frame numbers)
-            assert provider.get_total_frames() == 2
-            assert 1 in provider.get_available_frames()
-            assert 2 in provider.get_available_frames()
-            
-            # But loading should return empty detections due to invalid data
-            frame_data_1 = provider.load(1)
-            assert frame_data_1.frame_number == 1
-            assert len(frame_data_1.detections) == 0
-            
-            frame_data_2 = provider.load(2)
-            assert frame_data_2.frame_number == 2
-            assert len(frame_data_2.detections) == 0
-            
-        finally:
-            os.unlink(temp_path)
+        temp_path = write_mot_file(lines_with_valid_frames_invalid_data)
+        
+        provider = MOTDataProvider(temp_path, cache_size=10)
+        
+        # Frames should be indexed (valid frame numbers)
+        assert provider.get_total_frames() == 2
+        assert 1 in provider.get_available_frames()
+        assert 2 in provider.get_available_frames()
+        
+        # But loading should return empty detections due to invalid data
+        frame_data_1 = provider.load(1)
+        assert frame_data_1.frame_number == 1
+        assert len(frame_data_1.detections) == 0
+        
+        frame_data_2 = provider.load(2)
+        assert frame_data_2.frame_number == 2
+        assert len(frame_data_2.detections) == 0
     
     def test_cache_lru_behavior(self, temp_mot_file: str) -> None:
         """Test LRU cache eviction behavior."""
@@ -179,7 +212,7 @@ class TestMOTDataProvider:
         assert stats['cache_hits'] == 1
         assert stats['cache_misses'] == 4
     
-    def test_index_building_with_duplicate_frames(self) -> None:
+    def test_index_building_with_duplicate_frames(self, write_mot_file: Callable[[List[str]], str]) -> None:
         """Test index building when same frame appears multiple times."""
         data_lines = [
             "1,1,100,200,50,75,0.9,125,237",
@@ -187,30 +220,46 @@ class TestMOTDataProvider:
             "1,3,300,400,70,90,0.7,335,445",  # Same frame, different detection
         ]
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            for line in data_lines:
-                f.write(line + '\n')
-            temp_path = f.name
-        
-        try:
-            provider = MOTDataProvider(temp_path, cache_size=10)
-            
-            assert provider.get_total_frames() == 1  # Only one unique frame
-            assert 1 in provider.get_available_frames()
-            
-            # Loading frame 1 should return all 3 detections
-            frame_data = provider.load(1)
-            assert frame_data.frame_number == 1
-            assert len(frame_data.detections) == 3
-            
-            # Verify all detections are present
-            track_ids = [det.track_id for det in frame_data.detections]
-            assert sorted(track_ids) == [1, 2, 3]
-            
-        finally:
-            os.unlink(temp_path)
+        temp_path = write_mot_file(data_lines)
+        
+        provider = MOTDataProvider(temp_path, cache_size=10)
+        
+        assert provider.get_total_frames() == 1  # Only one unique frame
+        assert 1 in provider.get_available_frames()
+        
+        # Loading frame 1 should return all 3 detections
+        frame_data = provider.load(1)
+        assert frame_data.frame_number == 1
+        assert len(frame_data.detections) == 3
+        
+        # Verify all detections are present
+        track_ids = [det.track_id for det in frame_data.detections]
+        assert sorted(track_ids) == [1, 2, 3]
+    
+    def test_index_building_with_interleaved_frames(self, write_mot_file: Callable[[List[str]], str]) -> None:
+        """Test index building when a frame's lines are not adjacent in the file."""
+        data_lines = [
+            "2,1,100,200,50,75,0.9,125,237",
+            "1,1,200,300,60,80,0.8,230,340",
+            "2,2,300,400,70,90,0.7,335,445",
+            "3,1,400,500,80,95,0.6,440,550",
+            "1,2,500,600,90,99,0.5,545,655",
+        ]
+        
+        temp_path = write_mot_file(data_lines)
+        
+        provider = MOTDataProvider(temp_path, cache_size=10)
+        
+        assert provider.get_available_frames() == {1, 2, 3}
+        assert provider.get_stats()['total_indexed_lines'] == 5
+        
+        # Each frame gets all of its lines, in file order
+        assert [d.bb_left for d in provider.load(1).detections] == [200, 500]
+        assert [d.bb_left for d in provider.load(2).detections] == [100, 300]
+        assert [d.bb_left for d in provider.load(3).detections] == [400]
+        provider.close()
     
-    def test_file_seeking_accuracy(self) -> None:
+    def test_file_seeking_accuracy(self, write_mot_file: Callable[[List[str]], str]) -> None:
         """Test that file seeking reads correct data from correct positions."""
         # Create a file with known byte positions
         data_lines = [
@@ -219,30 +268,23 @@ class TestMOTDataProvider:
             "10,1,1000,1100,50,75,0.9,1025,1137",  # Frame 10
         ]
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            for line in data_lines:
-                f.write(line + '\n')
-            temp_path = f.name
-        
-        try:
-            provider = MOTDataProvider(temp_path, cache_size=10)
-            
-            # Test loading frame 5 specifically
-            frame_data = provider.load(5)
-            assert frame_data.frame_number == 5
-            assert len(frame_data.detections) == 1
-            assert frame_data.detections[0].bb_left == 500
-            assert frame_data.detections[0].bb_top == 600
-            
-            # Test loading frame 10
-            frame_data = provider.load(10)
-            assert frame_data.frame_number == 10
-            assert len(frame_data.detections) == 1
-            assert frame_data.detections[0].bb_left == 1000
-            assert frame_data.detections[0].bb_top == 1100
-            
-        finally:
-            os.unlink(temp_path)
+        temp_path = write_mot_file(data_lines)
+        
+        provider = MOTDataProvider(temp_path, cache_size=10)
+        
+        # Test loading frame 5 specifically
+        frame_data = provider.load(5)
+        assert frame_data.frame_number == 5
+        assert len(frame_data.detections) == 1
+        assert frame_data.detections[0].bb_left == 500
+        assert frame_data.detections[0].bb_top == 600
+        
+        # Test loading frame 10
+        frame_data = provider.load(10)
+        assert frame_data.frame_number == 10
+        assert len(frame_data.detections) == 1
+        assert frame_data.detections[0].bb_left == 1000
+        assert frame_data.detections[0].bb_top == 1100
     
     def test_statistics_collection(self, temp_mot_file: str) -> None:
         """Test that statistics are collected correctly."""
@@ -264,6 +306,7 @@ class TestMOTDataProvider:
         assert stats['cache_misses'] == 2
         assert stats['cache_hit_rate'] == 1/3
         assert stats['total_frames'] == 3
+        assert stats['total_indexed_lines'] == 5
         assert 'avg_cache_hit_time' in stats
         assert 'avg_cache_miss_time' in stats
     
@@ -293,17 +336,19 @@ class TestMOTDataProvider:
         """Test that resources are properly cleaned up."""
         provider = MOTDataProvider(temp_mot_file, cache_size=10)
         
-        # Load some data to open file handle
+        # Load some data to open the file descriptor
         provider.load(1)
         
-        # Ensure file handle is open
-        assert provider._file_handle is not None
-        assert not provider._file_handle.closed
+        # Ensure the file descriptor is open
+        fd = provider._fd
+        assert fd is not None
+        os.fstat(fd)
         
         # Close should clean up resources
         provider.close()
         
-        assert provider._file_handle.closed
+        assert provider._fd is None
+        assert provider._mmap is None
         assert len(provider.frame_cache) == 0
     
     def test_batch_loading_cache_interaction(self, temp_mot_file: str) -> None:
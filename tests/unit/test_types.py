@@ -2,10 +2,12 @@
 
 import pytest
 import time
+from array import array
 from dynamic_prefetching_cache.types import (
     EvictionPolicyOldest,
     EvictionPolicyLargest,
     EvictionPolicySmallest,
+    EvictionPolicyTwoRandom,
     CacheEntry,
     CacheMetrics,
     MOTDetection,
@@ -61,6 +63,25 @@ class TestEvictionPolicies:
         
         victim = policy.pick_victim(cache_contents, {})
         assert victim == 1  # Smallest data
+    
+    @pytest.mark.unit
+    def test_eviction_policy_two_random(self) -> None:
+        """Test 2-random eviction policy."""
+        policy = EvictionPolicyTwoRandom()
+        
+        # With two entries both are sampled, so the older one is always chosen
+        cache_contents = {
+            1: CacheEntry("data1", 2000.0),
+            2: CacheEntry("data2", 1000.0),
+        }
+        assert policy.pick_victim(cache_contents, {}) == 2
+        
+        # The newest entry can never win a comparison
+        cache_contents[3] = CacheEntry("data3", 3000.0)
+        for _ in range(20):
+            assert policy.pick_victim(cache_contents, {}) in (1, 2)
+        
+        assert policy.pick_victim({5: CacheEntry("only", 1.0)}, {}) == 5
 
 
 class TestDataStructures:
@@ -75,9 +96,9 @@ class TestDataStructures:
         assert entry1.timestamp == 1234.5
         
         # Test with zero timestamp (should auto-assign)
-        before_time = time.time()
+        before_time = time.monotonic_ns()
         entry2 = CacheEntry("data", 0)
-        after_time = time.time()
+        after_time = time.monotonic_ns()
         
         assert entry2.data == "data"
         assert before_time <= entry2.timestamp <= after_time
@@ -110,6 +131,7 @@ class TestDataStructures:
         assert not (task2 < task1)
         assert not (task1 < task3)  # Same priority, no ordering
         assert not (task3 < task1)
+        assert not hasattr(task1, '__dict__')
     
     @pytest.mark.unit
     def test_mot_detection_creation(self) -> None:
@@ -144,9 +166,35 @@ class TestDataStructures:
             MOTDetection(1, 43, 150.0, 250.0, 60.0, 80.0, 0.87, 130, 242)
         ]
         
-        frame_data = MOTFrameData(frame_number=1, detections=detections)
+        frame_data = MOTFrameData.from_detections(frame_number=1, detections=detections)
         
         assert frame_data.frame_number == 1
         assert len(frame_data.detections) == 2
         assert frame_data.detections[0].track_id == 42
-        assert frame_data.detections[1].track_id == 43 
\ No newline at end of file
+        assert frame_data.detections[1].track_id == 43
+        assert frame_data.detections == detections
+        
+        # The pre-flat-layout keyword is still accepted
+        assert MOTFrameData(frame_number=1, detections=detections) == frame_data
+        with pytest.raises(TypeError):
+            MOTFrameData(frame_number=1, data=frame_data.data, detections=detections)
+    
+    @pytest.mark.unit
+    def test_mot_frame_data_rows(self) -> None:
+        """Test row access and column slices of the flat detection array."""
+        frame_data = MOTFrameData(frame_number=1, data=array('d', [
+            1, 42, 100.0, 200.0, 50.0, 75.0, 0.95, 125, 237,
+            1, 43, 150.0, 250.0, 60.0, 80.0, 0.87, 130, 242
+        ]))
+        
+        assert frame_data.num_detections == 2
+        assert frame_data[1].bb_left == 150.0
+        assert frame_data[-1].track_id == 43
+        assert list(frame_data.column('bb_top')) == [200.0, 250.0]
+        assert [row[1] for row in frame_data.rows()] == [42, 43]
+        assert len(frame_data.detections) == 2
+        assert frame_data.detections[-1] == frame_data[1]
+        assert frame_data.detections[1:] == [frame_data[1]]
+        with pytest.raises(IndexError):
+            frame_data[2]
+        assert MOTFrameData(frame_number=2).detections == []